@@ -17,31 +17,387 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
+from copy import copy as shallow_copy
+from copy import deepcopy
+from hashlib import sha256
 from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Final
+from typing import NamedTuple
+from uuid import uuid4
+from weakref import finalize
 
+from numpy import asarray
+from numpy import atleast_1d
+from numpy import atleast_2d
+from numpy import memmap
 from scilab2py import scilab
 
+from gemseo_scilab.recording import CallRecord
+
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Mapping
     from collections.abc import Sequence
 
     from numpy import ndarray
 
+    from gemseo_scilab.recording import ScilabCallRecorder
+
 LOGGER = logging.getLogger(__name__)
 
 
+class ScilabEngine:
+    """The Scilab engine of the current process.
+
+    The engine wraps the global `scilab` session of `scilab2py`
+    and records the script directories loaded in it,
+    so that a package is loaded only once per process
+    and reloaded only when its `.sci` files have changed.
+
+    When a process is forked,
+    the child process inherits the session of its parent,
+    whose pipes cannot be shared.
+    At its first use from the child process,
+    the engine starts a new Scilab session
+    and reloads the script directories loaded so far.
+
+    For long-running sessions,
+    the engine can also recycle the Scilab session between two function calls:
+    every `clear_period` calls, the Scilab workspace is cleared;
+    every `restart_period` calls or as soon as the resident memory of the Scilab
+    process exceeds `max_rss` bytes, the Scilab session is restarted.
+    In both cases, the script directories are reloaded
+    from snapshots of their `.sci` files taken when they were loaded,
+    so that a change of a file during a run does not change the loaded code.
+    A value of 0 disables the corresponding recycling.
+
+    The engine also records the functions profiled in the Scilab session,
+    so that their profiling is enabled again, with reset statistics,
+    when they are reloaded.
+    """
+
+    clear_period: int
+    restart_period: int
+    max_rss: int
+    __n_calls: int
+    __n_calls_since_clear: int
+    __pid: int
+    __script_dir_hashes: dict[Path, str]
+    __profiled_names: dict[Path, set[str]]
+    __inherited_sessions: list[Any]
+    __sci_defs: dict[str, str]
+    __sci_def_dir: TemporaryDirectory | None
+    __snapshot_dir: TemporaryDirectory | None
+    __output_dir: TemporaryDirectory | None
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.clear_period = 0
+        self.restart_period = 0
+        self.max_rss = 0
+        self.__n_calls = 0
+        self.__n_calls_since_clear = 0
+        self.__pid = os.getpid()
+        self.__script_dir_hashes = {}
+        self.__profiled_names = {}
+        self.__inherited_sessions = []
+        self.__sci_defs = {}
+        self.__sci_def_dir = None
+        self.__snapshot_dir = None
+        self.__output_dir = None
+
+    @property
+    def output_dir_path(self) -> Path:
+        """The temporary directory where Scilab writes the large outputs."""
+        if self.__output_dir is None:
+            self.__output_dir = TemporaryDirectory(prefix="gemseo_scilab_outputs_")
+
+        return Path(self.__output_dir.name)
+
+    @property
+    def script_dir_paths(self) -> tuple[Path, ...]:
+        """The script directories loaded in the Scilab session."""
+        return tuple(self.__script_dir_hashes)
+
+    @property
+    def n_calls(self) -> int:
+        """The number of function calls since the start of the Scilab session."""
+        return self.__n_calls
+
+    @property
+    def rss(self) -> int:
+        """The resident memory of the Scilab process in bytes.
+
+        It is read from `/proc` and is 0 when not available, e.g. on Windows.
+        """
+        process = getattr(scilab._session, "proc", None)
+        if process is None:
+            return 0
+
+        try:
+            statm = Path(f"/proc/{process.pid}/statm").read_text()
+        except OSError:
+            return 0
+
+        return int(statm.split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    def load(self, script_dir_path: Path) -> None:
+        """Load the functions of a script directory if not loaded or changed since.
+
+        Args:
+            script_dir_path: The path to the directory containing the .sci files.
+        """
+        self.check_process()
+        sources = _read_script_dir(script_dir_path)
+        script_dir_hash = _hash_sources(sources)
+        if self.__script_dir_hashes.get(script_dir_path) == script_dir_hash:
+            LOGGER.debug("Scilab script directory already loaded: %s", script_dir_path)
+            return
+
+        if self.__snapshot_dir is None:
+            self.__snapshot_dir = TemporaryDirectory(prefix="gemseo_scilab_snapshots_")
+
+        # The loaded files are kept to reload the same code when recycling.
+        snapshot_dir_path = self.__get_snapshot_dir_path(script_dir_hash)
+        snapshot_dir_path.mkdir(exist_ok=True)
+        for file_name, source in sources.items():
+            (snapshot_dir_path / file_name).write_bytes(source)
+
+        scilab.getd(str(snapshot_dir_path))
+        self.__script_dir_hashes[script_dir_path] = script_dir_hash
+        self.__apply_profiling(script_dir_path)
+
+    def add_profiling(self, script_dir_path: Path, names: Iterable[str]) -> None:
+        """Enable the Scilab profiling of functions if not already enabled.
+
+        Args:
+            script_dir_path: The path to the directory containing the .sci files
+                defining the functions.
+            names: The names of the functions.
+        """
+        self.check_process()
+        profiled_names = self.__profiled_names.setdefault(script_dir_path, set())
+        for name in names:
+            if name not in profiled_names:
+                scilab.add_profiling(name)
+                profiled_names.add(name)
+
+    def remove_profiling(self, script_dir_path: Path, names: Iterable[str]) -> None:
+        """Disable the Scilab profiling of functions if enabled.
+
+        Args:
+            script_dir_path: The path to the directory containing the .sci files
+                defining the functions.
+            names: The names of the functions.
+        """
+        self.check_process()
+        profiled_names = self.__profiled_names.get(script_dir_path, set())
+        for name in names:
+            if name in profiled_names:
+                scilab.remove_profiling(name)
+                profiled_names.remove(name)
+
+    def define(self, name: str, sci_def: str) -> None:
+        """Define a generated function in the Scilab session if not already defined.
+
+        The definition is written in a temporary sci file,
+        so that it is reloaded with the script directories
+        when the Scilab session is recycled.
+
+        Args:
+            name: The name of the function.
+            sci_def: The Scilab definition of the function.
+        """
+        self.check_process()
+        if self.__sci_defs.get(name) == sci_def:
+            return
+
+        if self.__sci_def_dir is None:
+            self.__sci_def_dir = TemporaryDirectory(prefix="gemseo_scilab_")
+
+        sci_def_dir_path = Path(self.__sci_def_dir.name)
+        (sci_def_dir_path / f"{name}.sci").write_text(sci_def)
+        scilab.getd(str(sci_def_dir_path))
+        self.__sci_defs[name] = sci_def
+
+    def check_process(self) -> None:
+        """Start a new Scilab session if the current one belongs to another process."""
+        pid = os.getpid()
+        if pid == self.__pid:
+            return
+
+        LOGGER.debug("Starting a Scilab session for the process %s", pid)
+        # Closing the inherited session would stop the Scilab process of the parent,
+        # so it is kept alive instead of being garbage collected.
+        self.__inherited_sessions.append(scilab._session)
+        scilab._session = None
+        self.__pid = pid
+        self.restart()
+
+    def prepare_call(self) -> None:
+        """Prepare the Scilab session for a function call.
+
+        Recycle the Scilab session if a threshold is reached
+        and count the call.
+        """
+        self.check_process()
+        if (self.restart_period and self.__n_calls >= self.restart_period) or (
+            self.max_rss and self.rss > self.max_rss
+        ):
+            self.restart()
+        elif self.clear_period and self.__n_calls_since_clear >= self.clear_period:
+            self.clear()
+
+        self.__n_calls += 1
+        self.__n_calls_since_clear += 1
+
+    def clear(self) -> None:
+        """Clear the Scilab workspace and reload the script directories."""
+        LOGGER.debug("Clearing the Scilab workspace after %s calls", self.__n_calls)
+        scilab.eval("clear", verbose=False)
+        self.__reload()
+        self.__n_calls_since_clear = 0
+
+    def restart(self) -> None:
+        """Restart the Scilab session and reload the script directories."""
+        LOGGER.debug("Restarting the Scilab session after %s calls", self.__n_calls)
+        scilab.restart()
+        self.__reload()
+        self.__n_calls = 0
+        self.__n_calls_since_clear = 0
+
+    def __reload(self) -> None:
+        """Reload the script directories in the Scilab session as they were loaded."""
+        for script_dir_path, script_dir_hash in self.__script_dir_hashes.items():
+            if _hash_sources(_read_script_dir(script_dir_path)) != script_dir_hash:
+                LOGGER.warning(
+                    "The Scilab script directory %s has changed since it was loaded; "
+                    "the loaded version is reloaded.",
+                    script_dir_path,
+                )
+
+            scilab.getd(str(self.__get_snapshot_dir_path(script_dir_hash)))
+            self.__apply_profiling(script_dir_path)
+
+        if self.__sci_def_dir is not None:
+            scilab.getd(self.__sci_def_dir.name)
+
+    def __get_snapshot_dir_path(self, script_dir_hash: str) -> Path:
+        """Return the path to the snapshot of a script directory.
+
+        Args:
+            script_dir_hash: The hash of the .sci files of the directory.
+
+        Returns:
+            The path to the directory containing the loaded .sci files.
+        """
+        return Path(self.__snapshot_dir.name) / script_dir_hash
+
+    def __apply_profiling(self, script_dir_path: Path) -> None:
+        """Enable the Scilab profiling of the reloaded functions of a directory.
+
+        Loading a function removes its profiling instrumentation.
+
+        Args:
+            script_dir_path: The path to the directory containing the .sci files.
+        """
+        for name in self.__profiled_names.get(script_dir_path, ()):
+            scilab.add_profiling(name)
+
+
+def _read_script_dir(script_dir_path: Path) -> dict[str, bytes]:
+    """Read the .sci files of a directory.
+
+    Args:
+        script_dir_path: The path to the directory containing the .sci files.
+
+    Returns:
+        The contents of the .sci files bound to their names, sorted by name.
+    """
+    return {
+        file_path.name: file_path.read_bytes()
+        for file_path in sorted(script_dir_path.glob("*.sci"))
+    }
+
+
+def _hash_sources(sources: Mapping[str, bytes]) -> str:
+    """Hash the contents of .sci files.
+
+    Args:
+        sources: The contents of the .sci files bound to their names.
+
+    Returns:
+        The hash of the names and contents of the .sci files.
+    """
+    script_dir_hash = sha256()
+    for file_name, source in sources.items():
+        script_dir_hash.update(file_name.encode())
+        script_dir_hash.update(source)
+
+    return script_dir_hash.hexdigest()
+
+
+def _get_sci_name(prefix: str, key: str) -> str:
+    """Return the name of a generated Scilab object.
+
+    Args:
+        prefix: The prefix of the name.
+        key: The key identifying the object, hashed in the name.
+
+    Returns:
+        The name of the object.
+    """
+    # Scilab 5 truncates the names to 24 characters.
+    return f"{prefix}_{sha256(key.encode()).hexdigest()[:10]}"
+
+
+ENGINE: Final[ScilabEngine] = ScilabEngine()
+"""The Scilab engine of the current process."""
+
+
+def initialize_worker(*script_dir_paths: str | Path) -> None:
+    """Initialize a worker process with a warm Scilab engine.
+
+    This function is intended to be passed as `initializer`
+    to a process pool,
+    e.g. `ProcessPoolExecutor(initializer=initialize_worker, initargs=(path,))`,
+    so that the Scilab functions are loaded once per worker
+    and not at each task.
+
+    The process pools dispatch a task to any idle worker,
+    so a discipline is not bound to a worker:
+    each worker loads all the script directories instead,
+    so that any discipline unpickled in a worker finds its functions loaded.
+
+    Args:
+        *script_dir_paths: The paths to the directories to scan for .sci files.
+    """
+    for script_dir_path in script_dir_paths:
+        ENGINE.load(Path(script_dir_path))
+
+
 class ScilabFunction:
     """A scilab function."""
 
     _f_pointer: Callable | None
     _fun_def: str
+    _sci_def: str
+    __batch_function: ScilabFunction | None
+    __complex_step_function: ScilabFunction | None
+    __memmap_function: ScilabFunction | None
+    __selection_functions: dict[tuple[str, ...], tuple[ScilabFunction, ScilabFunction]]
     name: str
     args: Sequence[str]
     outs: Sequence[str]
+    source_hash: str
+    recorder: ScilabCallRecorder | None
 
     def __init__(
         self,
@@ -49,6 +405,8 @@ class ScilabFunction:
         name: str,
         args: Sequence[str],
         outs: Sequence[str],
+        source_hash: str = "",
+        sci_def: str = "",
     ) -> None:
         """Constructor.
 
@@ -57,22 +415,500 @@ class ScilabFunction:
             name: The name of the function.
             args: The arguments of the function.
             outs: The outputs of the function.
+            source_hash: The hash of the content of the source file of the function.
+            sci_def: The Scilab definition of a generated function,
+                to be defined in the Scilab session.
+                If empty, the function is assumed to be loaded from a sci file.
         """
         self._f_pointer = None
         self._fun_def = fun_def
+        self._sci_def = sci_def
+        self.__batch_function = None
+        self.__complex_step_function = None
+        self.__memmap_function = None
+        self.__selection_functions = {}
         self.name = name
         self.args = args
         self.outs = outs
+        self.source_hash = source_hash
+        self.recorder = None
 
         self.__init_from_def()
 
+    @classmethod
+    def from_signature(
+        cls,
+        name: str,
+        args: Sequence[str],
+        outs: Sequence[str],
+        source_hash: str = "",
+        sci_def: str = "",
+    ) -> ScilabFunction:
+        """Create a function from its Scilab signature.
+
+        Args:
+            name: The name of the function.
+            args: The arguments of the function.
+            outs: The outputs of the function.
+            source_hash: The hash of the content of the source file of the function.
+            sci_def: The Scilab definition of a generated function,
+                to be defined in the Scilab session.
+                If empty, the function is assumed to be loaded from a sci file.
+
+        Returns:
+            The function.
+        """
+        args_form = ", ".join(args)
+        outs_form = ", ".join(outs)
+        fun_def = f"""
+def {name}({args_form}):
+    '''Auto generated function from scilab.
+
+    name: {name}
+    arguments: {args_form}
+    outputs: {outs_form}
+    '''
+    {outs_form} = scilab.{name}({args_form})
+    return {outs_form}
+"""
+        return cls(fun_def, name, args, outs, source_hash, sci_def)
+
     def __call__(  # noqa: D102
         self, *args: Any, **kwargs: Any
     ) -> dict[str, float | ndarray]:
-        return self._f_pointer(*args, **kwargs)
+        ENGINE.prepare_call()
+        if self.recorder is None:
+            return self._f_pointer(*args, **kwargs)
+
+        start = perf_counter()
+        outputs = self._f_pointer(*args, **kwargs)
+        duration = perf_counter() - start
+        if len(self.outs) == 1:
+            output_data = {self.outs[0]: outputs}
+        else:
+            output_data = dict(zip(self.outs, outputs, strict=False))
+
+        self.__record(args, kwargs, output_data, duration)
+        return outputs
+
+    def __record(
+        self,
+        args: Sequence[Any],
+        kwargs: Mapping[str, Any],
+        output_data: Mapping[str, Any],
+        duration: float,
+    ) -> None:
+        """Record a call with the recorder.
+
+        Args:
+            args: The positional arguments of the function.
+            kwargs: The keyword arguments of the function.
+            output_data: The values of the outputs bound to their names.
+            duration: The duration of the call, in seconds.
+        """
+        inputs = dict(zip(self.args, args, strict=False))
+        inputs.update(kwargs)
+        self.recorder.record(CallRecord(self.name, inputs, dict(output_data), duration))
+
+    def batch_call(
+        self, *args: ndarray, n_workers: int = 0, chunk_size: int = 0
+    ) -> dict[str, ndarray]:
+        """Evaluate the function on a batch of samples with Scilab's `parallel_run`.
+
+        The samples are dispatched over several cores within the Scilab session.
+        The first sample is evaluated first to get the sizes of the outputs.
+
+        Args:
+            *args: The values of the arguments,
+                shaped as `(n_samples,)` or `(n_samples, arg_size)`.
+            n_workers: The number of Scilab workers.
+                If 0, use the number of cores.
+            chunk_size: The number of samples sent to a worker at once.
+                If 0, use the default of `parallel_run`.
+
+        Returns:
+            The values of the outputs shaped as `(n_samples, out_size)`.
+        """
+        if self.__batch_function is None:
+            self.__batch_function = self.__create_batch_function()
+
+        inputs = [asarray(arg).reshape(len(arg), -1).T for arg in args]
+        outputs = self.__batch_function(*inputs, n_workers, chunk_size)
+        if len(self.outs) == 1:
+            outputs = (outputs,)
+
+        return {
+            name: atleast_2d(output).T
+            for name, output in zip(self.outs, outputs, strict=False)
+        }
+
+    def complex_step_call(
+        self, *args: ndarray, step: float = 1e-30
+    ) -> dict[str, ndarray]:
+        """Compute derivatives by complex step for several perturbations at once.
+
+        All the perturbations are evaluated in a single Scilab call.
+        The Scilab function must be complex-step compatible,
+        e.g. use `.'` instead of `'` for the transposition
+        and avoid `abs`.
+
+        Args:
+            *args: The complex values of the arguments
+                shaped as `(arg_size, n_perturbations)`,
+                whose imaginary parts are the perturbations,
+                or the real values of the arguments not perturbed
+                shaped as `(arg_size, 1)` and used for all the perturbations.
+            step: The complex step.
+
+        Returns:
+            The derivatives of the outputs along the perturbations,
+            i.e. the imaginary parts of the outputs divided by the step,
+            shaped as `(out_size, n_perturbations)`.
+        """
+        if self.__complex_step_function is None:
+            self.__complex_step_function = self.__create_complex_step_function()
+
+        outputs = self.__complex_step_function(*args, step)
+        if len(self.outs) == 1:
+            outputs = (outputs,)
+
+        return {
+            name: atleast_2d(output)
+            for name, output in zip(self.outs, outputs, strict=False)
+        }
+
+    def call_with_outputs(
+        self, output_names: Iterable[str], *args: Any, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Call the function and retrieve only some outputs from Scilab.
+
+        The other outputs are kept in the Scilab session
+        and returned as `ScilabLazyOutput` objects
+        retrieving them on demand until the next call with the same outputs,
+        from any instance of the function,
+        or the recycling of the Scilab session.
+
+        Args:
+            output_names: The names of the outputs to retrieve.
+            *args: The positional arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            The values of the outputs bound to their names.
+
+        Raises:
+            ValueError: When no output is requested or an output is unknown.
+        """
+        output_names = set(output_names)
+        unknown_names = output_names.difference(self.outs)
+        if not output_names or unknown_names:
+            msg = (
+                f"The outputs to retrieve from {self.name} must be a non-empty subset "
+                f"of {', '.join(self.outs)}; got {', '.join(sorted(output_names))}."
+            )
+            raise ValueError(msg)
+
+        if len(output_names) == len(self.outs):
+            outputs = self(*args, **kwargs)
+            if len(self.outs) == 1:
+                outputs = (outputs,)
+
+            return dict(zip(self.outs, outputs, strict=False))
+
+        selection = tuple(name for name in self.outs if name in output_names)
+        if selection not in self.__selection_functions:
+            self.__selection_functions[selection] = self.__create_selection_functions(
+                selection
+            )
+
+        # The token identifies the call in the Scilab session
+        # to check that the kept outputs are the ones of this call.
+        token = uuid4().hex
+        start = perf_counter()
+        outputs = self.__selection_functions[selection][0](
+            *args, gemseo_token=token, **kwargs
+        )
+        duration = perf_counter() - start
+        if len(selection) == 1:
+            outputs = (outputs,)
+
+        output_data = dict(zip(selection, outputs, strict=False))
+        if self.recorder is not None:
+            # Only the retrieved outputs are recorded.
+            self.__record(args, kwargs, output_data, duration)
+
+        lazy_names = [name for name in self.outs if name not in output_names]
+        for index, name in enumerate(lazy_names, 1):
+            output_data[name] = ScilabLazyOutput(self, selection, index, token)
+
+        return output_data
+
+    def call_with_memmaps(
+        self, threshold: int, *args: Any, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Call the function and map the large outputs to files written by Scilab.
+
+        The real numerical outputs with more than `threshold` elements
+        are written by Scilab to binary files in `ENGINE.output_dir_path`
+        instead of being transferred through `scilab2py`,
+        and returned as flat `ScilabMemmap` objects paged in when accessed.
+
+        Args:
+            threshold: The number of elements above which an output is mapped.
+            *args: The positional arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            The values of the outputs bound to their names.
+        """
+        if self.__memmap_function is None:
+            self.__memmap_function = self.__create_memmap_function()
+
+        file_prefix = str(ENGINE.output_dir_path / f"{uuid4().hex}_")
+        start = perf_counter()
+        outputs = self.__memmap_function(
+            *args, gemseo_prefix=file_prefix, gemseo_threshold=threshold, **kwargs
+        )
+        duration = perf_counter() - start
+        sizes = atleast_1d(outputs[-1]).ravel()
+        output_data = {}
+        for name, output, size in zip(self.outs, outputs[:-1], sizes, strict=False):
+            if size:
+                output = ScilabMemmap.from_file(
+                    Path(f"{file_prefix}{name}.bin"), int(size)
+                )
+
+            output_data[name] = output
+
+        if self.recorder is not None:
+            # The memory-mapped outputs are recorded as arrays.
+            self.__record(
+                args,
+                kwargs,
+                {
+                    name: asarray(output)
+                    if isinstance(output, ScilabMemmap)
+                    else output
+                    for name, output in output_data.items()
+                },
+                duration,
+            )
+
+        return output_data
+
+    def fetch_lazy_output(
+        self, selection: tuple[str, ...], index: int, token: str
+    ) -> Any:
+        """Retrieve from Scilab an output kept by `call_with_outputs`.
+
+        The retrieval is not counted as a call by `ENGINE`,
+        so that it cannot recycle the Scilab session.
+
+        Args:
+            selection: The names of the outputs retrieved at the call.
+            index: The index of the output among the kept ones, starting from 1.
+            token: The token identifying the call.
+
+        Returns:
+            The value of the output.
+
+        Raises:
+            RuntimeError: When the function has been called again
+                with the same selection since
+                or the Scilab session has been recycled.
+        """
+        ENGINE.check_process()
+        getter = self.__selection_functions[selection][1]._f_pointer
+        value, is_available = getter(index, token)
+        if not is_available:
+            msg = (
+                f"The output of {self.name} is no longer available in Scilab "
+                "as the function has been called again "
+                "or the Scilab session has been recycled since."
+            )
+            raise RuntimeError(msg)
+
+        return value
+
+    def __create_selection_functions(
+        self, selection: tuple[str, ...]
+    ) -> tuple[ScilabFunction, ScilabFunction]:
+        """Create the functions retrieving some outputs and keeping the others.
+
+        Args:
+            selection: The names of the outputs to retrieve.
+
+        Returns:
+            The function returning the selected outputs
+            and keeping the others in a Scilab global list,
+            and the function returning an item of this list from its index.
+        """
+        key = f"{self.name}_{self.source_hash}_{'_'.join(selection)}"
+        name = _get_sci_name("gemseo_sel", key)
+        getter_name = _get_sci_name("gemseo_lg", key)
+        kept_outputs = _get_sci_name("gemseo_lz", key)
+        args_form = ", ".join(self.args)
+        lazy_form = ", ".join(out for out in self.outs if out not in selection)
+        # The first item of the list is the token of the call.
+        sci_def = "\n".join([
+            f"function [{', '.join(selection)}] = {name}({args_form}, gemseo_token)",
+            f"  global {kept_outputs}",
+            f"  [{', '.join(self.outs)}] = {self.name}({args_form});",
+            f"  {kept_outputs} = list(gemseo_token, {lazy_form});",
+            "endfunction",
+            "",
+            f"function [value, is_available] = {getter_name}(index, gemseo_token)",
+            f"  global {kept_outputs}",
+            "  value = [];",
+            "  is_available = %f;",
+            f"  if type({kept_outputs}) == 15 then",
+            f"    is_available = {kept_outputs}(1) == gemseo_token;",
+            "  end",
+            "  if is_available then",
+            f"    value = {kept_outputs}(index + 1);",
+            "  end",
+            "endfunction",
+            "",
+        ])
+        return (
+            ScilabFunction.from_signature(
+                name, [*self.args, "gemseo_token"], selection, self.source_hash, sci_def
+            ),
+            ScilabFunction.from_signature(
+                getter_name, ["index", "gemseo_token"], ["value", "is_available"]
+            ),
+        )
+
+    def __create_memmap_function(self) -> ScilabFunction:
+        """Create the function writing the large outputs to binary files.
+
+        Returns:
+            The function returning the small outputs,
+            empty matrices in place of the large ones
+            and the numbers of elements written per output, 0 for the small ones.
+        """
+        name = _get_sci_name("gemseo_mm", f"{self.name}_{self.source_hash}")
+        args = [*self.args, "gemseo_prefix", "gemseo_threshold"]
+        outs = [*self.outs, "gemseo_sizes"]
+        outs_form = ", ".join(self.outs)
+        lines = [
+            f"function [{', '.join(outs)}] = {name}({', '.join(args)})",
+            f"  [{outs_form}] = {self.name}({', '.join(self.args)});",
+            f"  gemseo_sizes = zeros(1, {len(self.outs)});",
+        ]
+        for index, out in enumerate(self.outs, 1):
+            # Write the rows one after the other as the flattening in Python.
+            lines.extend([
+                f"  if type({out}) == 1 then",
+                f'    if isreal({out}) & size({out}, "*") > gemseo_threshold then',
+                f"      %m_{out} = {out}.';",
+                f'      %fd = mopen(gemseo_prefix + "{out}.bin", "wb");',
+                f'      mput(%m_{out}(:), "dl", %fd);',
+                "      mclose(%fd);",
+                f'      gemseo_sizes({index}) = size({out}, "*");',
+                f"      {out} = [];",
+                "    end",
+                "  end",
+            ])
+
+        lines.extend(["endfunction", ""])
+        return ScilabFunction.from_signature(
+            name, args, outs, self.source_hash, "\n".join(lines)
+        )
+
+    def __create_complex_step_function(self) -> ScilabFunction:
+        """Create the function computing derivatives by complex step.
+
+        Returns:
+            The function computing derivatives by complex step.
+        """
+        name = _get_sci_name("gemseo_cs", f"{self.name}_{self.source_hash}")
+        args = [*self.args, "gemseo_step"]
+        # Pass the perturbed arguments as row vectors, as in a standard call,
+        # with a transposition that does not conjugate;
+        # the arguments not perturbed have a single column.
+        perturbed_args = ", ".join(
+            f"matrix({arg}(:, min(k, size({arg}, 2))), 1, -1)" for arg in self.args
+        )
+        n_columns = ", ".join(f"size({arg}, 2)" for arg in self.args)
+        outs_form = ", ".join(self.outs)
+        perturbed_outs_form = ", ".join(f"%o_{out}" for out in self.outs)
+        lines = [f"function [{outs_form}] = {name}({', '.join(args)})"]
+        lines.extend(f"  {out} = [];" for out in self.outs)
+        lines.extend([
+            f"  for k = 1:max([{n_columns}])",
+            f"    [{perturbed_outs_form}] = {self.name}({perturbed_args});",
+        ])
+        for out in self.outs:
+            # Flatten the outputs row by row as the flattening in Python
+            # with a transposition that does not conjugate.
+            lines.extend([
+                f"    %o_{out} = %o_{out}.';",
+                f"    {out} = [{out}, imag(%o_{out}(:)) / gemseo_step];",
+            ])
+        lines.extend(["  end", "endfunction", ""])
+        return ScilabFunction.from_signature(
+            name, args, self.outs, self.source_hash, "\n".join(lines)
+        )
+
+    def __create_batch_function(self) -> ScilabFunction:
+        """Create the function evaluating a batch of samples with `parallel_run`.
+
+        Returns:
+            The function evaluating a batch of samples.
+        """
+        key = f"{self.name}_{self.source_hash}"
+        name = _get_sci_name("gemseo_pr", key)
+        sample_name = _get_sci_name("gemseo_ps", key)
+        args = [*self.args, "gemseo_n_workers", "gemseo_chunk_size"]
+        args_form = ", ".join(self.args)
+        first_args = ", ".join(f"{arg}(:, 1)" for arg in self.args)
+        other_args = ", ".join(f"{arg}(:, 2:$)" for arg in self.args)
+        outs_form = ", ".join(self.outs)
+        other_outs_form = ", ".join(f"%r_{out}" for out in self.outs)
+        types = ", ".join('"constant"' for _ in self.outs)
+        dims = "; ".join(f"size({out}, 1), 1" for out in self.outs)
+        parallel_run = (
+            f"parallel_run({other_args}, {sample_name}, [{types}], [{dims}], "
+            "configuration)"
+        )
+        # parallel_run passes the samples as columns:
+        # the sample function passes them as rows, as in a standard call,
+        # and returns the outputs as columns flattened row by row,
+        # as the flattening in Python.
+        lines = [f"function [{outs_form}] = {sample_name}({args_form})"]
+        lines.extend(f"  {arg} = matrix({arg}, 1, -1);" for arg in self.args)
+        lines.append(f"  [{outs_form}] = {self.name}({args_form});")
+        lines.extend(f"  {out} = matrix({out}.', -1, 1);" for out in self.outs)
+        lines.extend([
+            "endfunction",
+            "",
+            f"function [{outs_form}] = {name}({', '.join(args)})",
+            f"  [{outs_form}] = {sample_name}({first_args});",
+        ])
+        add_param = 'configuration = add_param(configuration, "{}", gemseo_{});'
+        lines.extend([
+            f"  if size({self.args[0]}, 2) > 1 then",
+            "    configuration = init_param();",
+            "    if gemseo_n_workers > 0 then",
+            f"      {add_param.format('nb_workers', 'n_workers')}",
+            "    end",
+            "    if gemseo_chunk_size > 0 then",
+            f"      {add_param.format('chunk_size', 'chunk_size')}",
+            "    end",
+            f"    [{other_outs_form}] = {parallel_run};",
+        ])
+        lines.extend(f"    {out} = [{out}, %r_{out}];" for out in self.outs)
+        lines.extend(["  end", "endfunction", ""])
+        return ScilabFunction.from_signature(
+            name, args, self.outs, self.source_hash, "\n".join(lines)
+        )
 
     def __init_from_def(self) -> None:
         """Initialize the function from its definition."""
+        if self._sci_def:
+            ENGINE.define(self.name, self._sci_def)
+
         exec(self._fun_def)
         self._f_pointer = locals()[self.name]
 
@@ -87,6 +923,147 @@ class ScilabFunction:
         self.__init_from_def()
 
 
+class ScilabLazyOutput:
+    """An output of a Scilab function kept in the Scilab session until needed.
+
+    The value is retrieved from Scilab at the first access
+    and converted to a flat NumPy array by `numpy.asarray`,
+    as the other outputs of a `ScilabDiscipline`.
+    """
+
+    __function: ScilabFunction
+    __index: int
+    __is_fetched: bool
+    __selection: tuple[str, ...]
+    __token: str
+    __value: Any
+
+    def __init__(
+        self,
+        function: ScilabFunction,
+        selection: tuple[str, ...],
+        index: int,
+        token: str,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            function: The Scilab function.
+            selection: The names of the outputs retrieved at the call.
+            index: The index of the output among the kept ones, starting from 1.
+            token: The token identifying the call.
+        """
+        self.__function = function
+        self.__selection = selection
+        self.__index = index
+        self.__token = token
+        self.__is_fetched = False
+        self.__value = None
+
+    @property
+    def value(self) -> Any:
+        """The value of the output as returned by Scilab."""
+        if not self.__is_fetched:
+            self.__value = self.__function.fetch_lazy_output(
+                self.__selection, self.__index, self.__token
+            )
+            self.__is_fetched = True
+
+        return self.__value
+
+    def __array__(self, dtype: Any = None, copy: bool | None = None) -> ndarray:
+        return atleast_1d(asarray(self.value, dtype=dtype)).flatten()
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> ScilabLazyOutput:
+        # The copy shares the function to know whether the output is still available.
+        lazy_output = shallow_copy(self)
+        lazy_output.__value = deepcopy(self.__value, memo)
+        return lazy_output
+
+
+class ScilabMemmap(memmap):
+    """A read-only memory map of an output written to a binary file by Scilab.
+
+    The output is paged in when accessed.
+    As it is read-only, the copies share the memory map,
+    so that the caches of a discipline do not load the output in memory,
+    and the file is removed when the memory map is garbage collected.
+    """
+
+    @classmethod
+    def from_file(cls, file_path: Path, size: int) -> ScilabMemmap:
+        """Map a binary file of little-endian doubles written by Scilab.
+
+        Args:
+            file_path: The path to the file.
+            size: The number of elements.
+
+        Returns:
+            The memory map, removing the file when garbage collected.
+        """
+        array = cls(file_path, dtype="<f8", mode="r", shape=(size,))
+        finalize(array, _remove_file, file_path)
+        return array
+
+    def copy(self, order: str = "C") -> ndarray:  # noqa: D102
+        if self.flags.writeable:
+            return super().copy(order)
+
+        return self
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> ndarray:
+        if self.flags.writeable:
+            return super().__deepcopy__(memo)
+
+        return self
+
+
+def _remove_file(file_path: Path) -> None:
+    """Remove a file if possible.
+
+    Args:
+        file_path: The path to the file.
+    """
+    try:
+        file_path.unlink()
+    except OSError:
+        # E.g. the file is still mapped on Windows;
+        # it is removed with the temporary directory.
+        LOGGER.debug("Cannot remove %s", file_path)
+
+
+class ScilabFunctionProfile(NamedTuple):
+    """The profiling statistics of a Scilab function.
+
+    The statistics are given per line of the function,
+    the first line being the one declaring the function.
+    """
+
+    line_counts: ndarray
+    """The number of executions of each line."""
+
+    line_times: ndarray
+    """The CPU time spent on each line, in seconds."""
+
+    line_efforts: ndarray
+    """The effort of the Scilab interpreter for each line."""
+
+    @property
+    def n_calls(self) -> int:
+        """The number of calls to the function."""
+        return int(self.line_counts[0]) if self.line_counts.size else 0
+
+    @property
+    def total_time(self) -> float:
+        """The CPU time spent in the function, in seconds."""
+        return float(self.line_times.sum())
+
+    @property
+    def hot_lines(self) -> ndarray:
+        """The indices of the lines sorted by decreasing CPU time."""
+        return self.line_times.argsort()[::-1]
+
+
 class ScilabPackage:
     """Interface to a scilab package.
 
@@ -98,11 +1075,27 @@ class ScilabPackage:
     RE_FUNC: Final[re.Pattern] = re.compile(r"=([^$].*?)\(")
     RE_ARGS: Final[re.Pattern] = re.compile(r"\(([^$].*?)\)")
 
-    def __init__(self, script_dir_path: str | Path) -> None:
+    __PROFILE_NAME: Final[str] = "gemseo_profile"
+    """The name of the Scilab function returning the profiling of a function."""
+
+    # profile expects the function itself and not its name.
+    __PROFILE_SCI_DEF: Final[str] = "\n".join([
+        f"function [statistics] = {__PROFILE_NAME}(name)",
+        '  execstr("statistics = profile(" + name + ");");',
+        "endfunction",
+        "",
+    ])
+    """The Scilab definition of the function returning the profiling of a function."""
+
+    __is_profiling: bool
+    __script_dir_path: Path
+
+    def __init__(self, script_dir_path: str | Path, profile: bool = False) -> None:
         """Constructor.
 
         Args:
             script_dir_path: The path to the directory to scan for .sci files.
+            profile: Whether to enable the Scilab profiling of the functions.
 
         Raises:
             FileNotFoundError: If the `script_dir_path` does not exist.
@@ -118,15 +1111,20 @@ class ScilabPackage:
         # scilab.timeout = 10
         LOGGER.info("Using the scilab script directory: %s", script_dir_path)
 
-        scilab.getd(str(script_dir_path))
+        self.__script_dir_path = script_dir_path
+        ENGINE.load(script_dir_path)
         self.functions = {}
         self.__scan_funcs(script_dir_path)
+        self.__is_profiling = False
+        if profile:
+            self.enable_profiling()
 
-    def __scan_onef(self, line: str) -> None:
+    def __scan_onef(self, line: str, source_hash: str) -> None:
         """Scan a function in a sci file to parse its arguments, outputs and name.
 
         Args:
             line: The line from the sci file to scan.
+            source_hash: The hash of the content of the sci file.
 
         Raises:
             ValueError: If no function is found in `line`.
@@ -163,20 +1161,9 @@ class ScilabPackage:
         fargs = [args_str.strip() for args_str in args]
         LOGGER.debug("And arguments are: %s", args)
 
-        args_form = ", ".join(fargs)
-        outs_form = ", ".join(fouts)
-        fun_def = f"""
-def {fname}({args_form}):
-    '''Auto generated function from scilab.
-
-    name: {fname}
-    arguments: {args_form}
-    outputs: {outs_form}
-    '''
-    {outs_form} = scilab.{fname}({args_form})
-    return {outs_form}
-"""
-        self.functions[fname] = ScilabFunction(fun_def, fname, fargs, fouts)
+        self.functions[fname] = ScilabFunction.from_signature(
+            fname, fargs, fouts, source_hash
+        )
 
     def __scan_funcs(self, script_dir_path: Path) -> None:
         """Scan all functions in the directory.
@@ -186,19 +1173,80 @@ def {fname}({args_form}):
         """
         for script_f in script_dir_path.glob("*.sci"):
             LOGGER.info("Found script file: %s", script_f)
+            source = Path(script_f).read_bytes()
+            source_hash = sha256(source).hexdigest()
+
+            for line in source.decode().splitlines():
+                if not line.strip().startswith("function"):
+                    continue
+
+                try:
+                    self.__scan_onef(line, source_hash)
+                except ValueError:
+                    LOGGER.exception("Cannot generate interface for function %s", line)
+                    raise
 
-            with Path(script_f).open() as script:
-                for line in script:
-                    if not line.strip().startswith("function"):
-                        continue
-
-                    try:
-                        self.__scan_onef(line)
-                    except ValueError:
-                        LOGGER.exception(
-                            "Cannot generate interface for function %s", line
-                        )
-                        raise
+    @property
+    def is_profiling(self) -> bool:
+        """Whether the Scilab profiling of the functions is enabled."""
+        return self.__is_profiling
+
+    def enable_profiling(self) -> None:
+        """Enable the Scilab profiling of the functions.
+
+        The statistics of the previous profiling, if any, are reset,
+        as well as when the Scilab session is recycled.
+        """
+        ENGINE.add_profiling(self.__script_dir_path, self.functions)
+        self.reset_profiling()
+        self.__is_profiling = True
+
+    def disable_profiling(self) -> None:
+        """Disable the Scilab profiling of the functions."""
+        ENGINE.remove_profiling(self.__script_dir_path, self.functions)
+        self.__is_profiling = False
+
+    def reset_profiling(self) -> None:
+        """Reset the Scilab profiling statistics of the functions."""
+        ENGINE.check_process()
+        for name in self.functions:
+            scilab.reset_profiling(name)
+
+    def get_profiling_report(self) -> dict[str, ScilabFunctionProfile]:
+        """Return the Scilab profiling statistics of the functions.
+
+        Returns:
+            The profiling statistics of the functions bound to their names.
+
+        Raises:
+            RuntimeError: If the profiling is not enabled.
+        """
+        if not self.__is_profiling:
+            msg = "The Scilab profiling is not enabled."
+            raise RuntimeError(msg)
+
+        # The Scilab calls to get the report are not counted
+        # so that they cannot recycle the Scilab session.
+        profile = ScilabFunction.from_signature(
+            self.__PROFILE_NAME,
+            ["name"],
+            ["statistics"],
+            sci_def=self.__PROFILE_SCI_DEF,
+        )._f_pointer
+        report = {}
+        for name in self.functions:
+            statistics = atleast_2d(profile(name))
+            report[name] = ScilabFunctionProfile(
+                statistics[:, 0], statistics[:, 1], statistics[:, 2]
+            )
+
+        return report
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        ENGINE.load(self.__script_dir_path)
+        if self.__is_profiling:
+            self.enable_profiling()
 
     def __str__(self) -> str:
         sout = "Scilab python interface\nAvailable functions:\n"
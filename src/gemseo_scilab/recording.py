@@ -0,0 +1,198 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Record and replay of Scilab function calls."""
+
+from __future__ import annotations
+
+import logging
+import pickle
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+from numpy import abs as np_abs
+from numpy import array
+from numpy import asarray
+from numpy import quantile
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+    from collections.abc import Mapping
+
+    from numpy import ndarray
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CallRecord(NamedTuple):
+    """The record of a Scilab function call."""
+
+    function_name: str
+    """The name of the function."""
+
+    inputs: dict[str, Any]
+    """The values of the arguments bound to their names."""
+
+    outputs: dict[str, Any]
+    """The values of the outputs bound to their names."""
+
+    duration: float
+    """The duration of the call, in seconds."""
+
+
+class ScilabCallRecorder:
+    """An append-only recorder of Scilab function calls.
+
+    Each call is pickled and appended to the file,
+    so that several runs, or several processes, can record in the same file.
+    """
+
+    file_path: Path
+    """The path to the record file."""
+
+    def __init__(self, file_path: str | Path) -> None:
+        """Constructor.
+
+        Args:
+            file_path: The path to the record file.
+        """
+        self.file_path = Path(file_path)
+
+    def record(self, call_record: CallRecord) -> None:
+        """Append the record of a call to the file.
+
+        Args:
+            call_record: The record of the call.
+        """
+        # Pickle before opening the file to write a record at once.
+        data = pickle.dumps(tuple(call_record), protocol=pickle.HIGHEST_PROTOCOL)
+        with self.file_path.open("ab") as record_file:
+            record_file.write(data)
+
+
+def read_records(file_path: str | Path) -> Iterator[CallRecord]:
+    """Read the records of the calls from a record file.
+
+    Args:
+        file_path: The path to the record file.
+
+    Yields:
+        The records of the calls, in the order of the calls.
+    """
+    with Path(file_path).open("rb") as record_file:
+        try:
+            while True:
+                yield CallRecord(*pickle.load(record_file))
+        except EOFError:
+            return
+
+
+class ReplayReport(NamedTuple):
+    """The report of the replay of recorded Scilab function calls."""
+
+    durations: dict[str, ndarray]
+    """The durations of the replayed calls, in seconds, per function name."""
+
+    recorded_durations: dict[str, ndarray]
+    """The durations of the recorded calls, in seconds, per function name."""
+
+    max_differences: dict[str, dict[str, float]]
+    """The maximum absolute differences between the replayed and recorded outputs.
+
+    They are given as `{function_name: {output_name: max_difference}}`.
+    """
+
+    def get_duration_quantiles(
+        self, quantiles: Iterable[float] = (0.5, 0.9, 0.99)
+    ) -> dict[str, tuple[ndarray, ndarray]]:
+        """Return quantiles of the durations of the calls.
+
+        Args:
+            quantiles: The quantile levels.
+
+        Returns:
+            The quantiles of the replayed and recorded durations per function name.
+        """
+        levels = array(list(quantiles))
+        return {
+            name: (
+                quantile(durations, levels),
+                quantile(self.recorded_durations[name], levels),
+            )
+            for name, durations in self.durations.items()
+        }
+
+
+def replay(
+    file_path: str | Path, functions: Mapping[str, Callable[..., Any]]
+) -> ReplayReport:
+    """Replay recorded Scilab function calls.
+
+    Args:
+        file_path: The path to the record file.
+        functions: The functions to replay the calls with, bound to their names,
+            e.g. the functions of a `ScilabPackage`
+            loaded with another configuration.
+            A function returns either the value of a single output
+            or the values of the outputs in the order of its attribute `outs`,
+            e.g. a `ScilabFunction`, or else in the order of the record.
+            Only the recorded outputs are compared,
+            e.g. the required outputs of a `ScilabDiscipline`.
+
+    Returns:
+        The report of the replay.
+
+    Raises:
+        KeyError: If a recorded function is missing from `functions`.
+    """
+    durations = {}
+    recorded_durations = {}
+    max_differences = {}
+    for call_record in read_records(file_path):
+        name = call_record.function_name
+        if name not in functions:
+            msg = f"The recorded function {name} is not available for the replay."
+            raise KeyError(msg)
+
+        function = functions[name]
+        start = perf_counter()
+        outputs = function(**call_record.inputs)
+        durations.setdefault(name, []).append(perf_counter() - start)
+        recorded_durations.setdefault(name, []).append(call_record.duration)
+
+        output_names = getattr(function, "outs", list(call_record.outputs))
+        if len(output_names) == 1:
+            outputs = (outputs,)
+
+        outputs = dict(zip(output_names, outputs, strict=False))
+        differences = max_differences.setdefault(name, {})
+        for output_name, recorded_value in call_record.outputs.items():
+            difference = float(
+                np_abs(asarray(outputs[output_name]) - asarray(recorded_value)).max()
+            )
+            differences[output_name] = max(
+                difference, differences.get(output_name, 0.0)
+            )
+
+    LOGGER.info("Replayed the calls recorded in %s", file_path)
+    return ReplayReport(
+        {name: array(values) for name, values in durations.items()},
+        {name: array(values) for name, values in recorded_durations.items()},
+        max_differences,
+    )
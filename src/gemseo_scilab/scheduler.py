@@ -0,0 +1,313 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Cost-aware scheduling of Scilab function calls over several Scilab engines."""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+from multiprocessing import get_context
+from threading import Condition
+from threading import Thread
+from time import perf_counter
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+from gemseo_scilab.py_scilab import initialize_worker
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+    from typing_extensions import Self
+
+    from gemseo_scilab.py_scilab import ScilabFunction
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _execute(
+    function: ScilabFunction, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[Any, float]:
+    """Execute a Scilab function call in an engine process and time it.
+
+    Args:
+        function: The Scilab function.
+        args: The positional arguments of the function.
+        kwargs: The keyword arguments of the function.
+
+    Returns:
+        The outputs of the function and the duration of the call, in seconds.
+    """
+    start = perf_counter()
+    outputs = function(*args, **kwargs)
+    return outputs, perf_counter() - start
+
+
+class _Task(NamedTuple):
+    """A Scilab function call waiting for an engine."""
+
+    index: int
+    """The submission index of the call."""
+
+    function: ScilabFunction
+    """The Scilab function."""
+
+    args: tuple[Any, ...]
+    """The positional arguments of the function."""
+
+    kwargs: dict[str, Any]
+    """The keyword arguments of the function."""
+
+    future: Future
+    """The future of the call."""
+
+
+class ScilabScheduler:
+    """A scheduler of Scilab function calls over several Scilab engines.
+
+    Each engine is a spawned process with a warm Scilab session.
+    The processes are spawned and not forked
+    as the parent process runs threads,
+    e.g. the dispatchers of the scheduler and the reader of `scilab2py`.
+    The calls are queued in a single queue shared by the engines:
+    an idle engine takes the queued call with the highest estimated cost,
+    so that the long calls start first
+    and the short ones fill the engines freed in the meantime
+    instead of waiting behind a busy engine.
+
+    The cost of a function is estimated
+    from the durations of its past calls in the engines
+    with an exponential moving average.
+    The calls to a function without past call are considered the most expensive
+    so that their cost is learned as soon as possible.
+    """
+
+    __busy_time: float
+    __condition: Condition
+    __costs: dict[str, float]
+    __dispatchers: list[Thread]
+    __executors: list[ProcessPoolExecutor]
+    __is_shutdown: bool
+    __n_submissions: count
+    __running_starts: dict[int, float]
+    __smoothing: float
+    __start: float
+    __tasks: list[_Task]
+
+    def __init__(
+        self,
+        *script_dir_paths: str | Path,
+        n_engines: int = 2,
+        smoothing: float = 0.5,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            *script_dir_paths: The paths to the directories to scan for .sci files
+                in each engine.
+            n_engines: The number of Scilab engines.
+            smoothing: The weight of the last duration of a function
+                in the estimation of its cost, between 0 and 1.
+        """
+        self.__smoothing = smoothing
+        self.__condition = Condition()
+        self.__tasks = []
+        self.__costs = {}
+        self.__n_submissions = count()
+        self.__running_starts = {}
+        self.__busy_time = 0.0
+        self.__is_shutdown = False
+        self.__start = perf_counter()
+        context = get_context("spawn")
+        self.__executors = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=initialize_worker,
+                initargs=script_dir_paths,
+            )
+            for _ in range(n_engines)
+        ]
+        self.__dispatchers = [
+            Thread(target=self.__dispatch, args=(engine_index,), daemon=True)
+            for engine_index in range(n_engines)
+        ]
+        for dispatcher in self.__dispatchers:
+            dispatcher.start()
+
+    @property
+    def n_engines(self) -> int:
+        """The number of Scilab engines."""
+        return len(self.__executors)
+
+    @property
+    def costs(self) -> dict[str, float]:
+        """The estimated costs of the functions, in seconds, bound to their names."""
+        with self.__condition:
+            return dict(self.__costs)
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of calls waiting for an engine."""
+        with self.__condition:
+            return len(self.__tasks)
+
+    @property
+    def utilization(self) -> float:
+        """The fraction of the engine time spent in calls since the creation."""
+        with self.__condition:
+            now = perf_counter()
+            busy_time = self.__busy_time + sum(
+                now - start for start in self.__running_starts.values()
+            )
+            elapsed_time = now - self.__start
+
+        if not elapsed_time:
+            return 0.0
+
+        return busy_time / (elapsed_time * self.n_engines)
+
+    def submit(self, function: ScilabFunction, *args: Any, **kwargs: Any) -> Future:
+        """Submit a Scilab function call.
+
+        Args:
+            function: The Scilab function.
+            *args: The positional arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            The future of the outputs of the function.
+
+        Raises:
+            RuntimeError: When the scheduler is shut down.
+        """
+        future = Future()
+        with self.__condition:
+            if self.__is_shutdown:
+                msg = "The Scilab scheduler is shut down."
+                raise RuntimeError(msg)
+
+            self.__tasks.append(
+                _Task(next(self.__n_submissions), function, args, kwargs, future)
+            )
+            self.__condition.notify()
+
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the scheduler.
+
+        The calls submitted before are executed.
+
+        Args:
+            wait: Whether to wait for the calls to be executed.
+        """
+        with self.__condition:
+            self.__is_shutdown = True
+            self.__condition.notify_all()
+
+        if wait:
+            for dispatcher in self.__dispatchers:
+                dispatcher.join()
+
+        for executor in self.__executors:
+            executor.shutdown(wait=wait)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.shutdown()
+
+    def __pop_task(self) -> _Task | None:
+        """Wait for the queued call with the highest estimated cost.
+
+        Returns:
+            The call, or `None` when the scheduler is shut down
+            and no call is queued.
+        """
+        with self.__condition:
+            while not self.__tasks:
+                if self.__is_shutdown:
+                    return None
+
+                self.__condition.wait()
+
+            # The costs evolve with the calls, so they are compared at dispatch time;
+            # the oldest call breaks the ties.
+            task = min(
+                self.__tasks,
+                key=lambda task: (
+                    -self.__costs.get(task.function.name, float("inf")),
+                    task.index,
+                ),
+            )
+            self.__tasks.remove(task)
+            return task
+
+    def __dispatch(self, engine_index: int) -> None:
+        """Execute the queued calls in an engine until the shutdown.
+
+        Args:
+            engine_index: The index of the engine.
+        """
+        executor = self.__executors[engine_index]
+        while (task := self.__pop_task()) is not None:
+            if not task.future.set_running_or_notify_cancel():
+                continue
+
+            with self.__condition:
+                self.__running_starts[engine_index] = perf_counter()
+
+            try:
+                outputs, duration = executor.submit(
+                    _execute, task.function, task.args, task.kwargs
+                ).result()
+            except BaseException as error:  # noqa: BLE001
+                task.future.set_exception(error)
+            else:
+                self.__update_cost(task.function.name, duration)
+                task.future.set_result(outputs)
+            finally:
+                with self.__condition:
+                    start = self.__running_starts.pop(engine_index)
+                    self.__busy_time += perf_counter() - start
+
+    def __update_cost(self, name: str, duration: float) -> None:
+        """Update the estimated cost of a function.
+
+        Args:
+            name: The name of the function.
+            duration: The duration of the last call, in seconds.
+        """
+        with self.__condition:
+            cost = self.__costs.get(name)
+            if cost is None:
+                self.__costs[name] = duration
+            else:
+                self.__costs[name] = (
+                    self.__smoothing * duration + (1 - self.__smoothing) * cost
+                )
+
+            LOGGER.debug("Estimated cost of %s: %s s", name, self.__costs[name])
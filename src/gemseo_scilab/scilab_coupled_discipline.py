@@ -0,0 +1,252 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Scilab discipline solving the couplings between Scilab functions in Scilab."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+from typing import ClassVar
+from typing import Final
+
+from gemseo.core.discipline.discipline import Discipline
+from numpy import zeros
+from strenum import StrEnum
+
+from gemseo_scilab.py_scilab import ScilabFunction
+from gemseo_scilab.py_scilab import ScilabPackage
+from gemseo_scilab.py_scilab import _get_sci_name
+from gemseo_scilab.scilab_discipline import ScilabDataProcessor
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+    from gemseo.typing import StrKeyMapping
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ScilabCoupledDiscipline(Discipline):
+    """A discipline solving the couplings between Scilab functions in Scilab.
+
+    The Scilab functions are evaluated in a fixed-point loop
+    generated and executed in Scilab,
+    so that the coupling variables are not transferred between Python and Scilab
+    at each iteration:
+    only the converged couplings and the outputs are returned to Python.
+
+    The coupling variables are the outputs of the functions
+    that are also arguments of the functions.
+    They are both inputs, used as initial guesses, and outputs of the discipline.
+    """
+
+    class Method(StrEnum):
+        """The fixed-point method."""
+
+        GAUSS_SEIDEL = "GaussSeidel"
+        """Each function uses the coupling variables
+        computed by the previous functions at the same iteration."""
+
+        JACOBI = "Jacobi"
+        """Each function uses the coupling variables
+        computed at the previous iteration."""
+
+    N_ITERATIONS: Final[str] = "fixed_point_iterations"
+    """The name of the output for the number of iterations."""
+
+    RESIDUAL: Final[str] = "fixed_point_residual"
+    """The name of the output for the relative residual of the coupling variables."""
+
+    __PREVIOUS_PREFIX: ClassVar[str] = "%p_"
+    """The prefix of the Scilab variables storing the previous coupling variables."""
+
+    coupling_names: tuple[str, ...]
+    """The names of the coupling variables."""
+
+    __tolerance: float
+
+    def __init__(
+        self,
+        function_names: Sequence[str],
+        script_dir_path: str | Path,
+        method: Method = Method.GAUSS_SEIDEL,
+        tolerance: float = 1e-6,
+        max_iter: int = 20,
+        name: str = "",
+    ) -> None:
+        """Constructor.
+
+        Args:
+            function_names: The names of the coupled scilab functions,
+                in the order of evaluation for the Gauss-Seidel method.
+            script_dir_path: The path to the directory to scan for `.sci` files.
+            method: The fixed-point method.
+            tolerance: The tolerance on the relative residual
+                of the coupling variables.
+            max_iter: The maximum number of iterations.
+            name: The name of the discipline.
+                If empty, join the names of the functions with underscores.
+
+        Raises:
+            ValueError: If a function is not in any of the files of
+                the `script_dir_path`.
+        """
+        self.__scilab_package = ScilabPackage(script_dir_path)
+        self.__tolerance = tolerance
+        for function_name in function_names:
+            if function_name not in self.__scilab_package.functions:
+                msg = (
+                    f"The function named {function_name}"
+                    f" is not in script_dir {script_dir_path}"
+                )
+                raise ValueError(msg)
+
+        functions = [
+            self.__scilab_package.functions[function_name]
+            for function_name in function_names
+        ]
+        output_names = list(
+            dict.fromkeys(out for function in functions for out in function.outs)
+        )
+        arg_names = dict.fromkeys(
+            arg for function in functions for arg in function.args
+        )
+        self.coupling_names = tuple(
+            data_name for data_name in output_names if data_name in arg_names
+        )
+        input_names = [
+            data_name for data_name in arg_names if data_name not in self.coupling_names
+        ] + list(self.coupling_names)
+        output_names += [self.N_ITERATIONS, self.RESIDUAL]
+
+        key = repr((
+            [(function.name, function.source_hash) for function in functions],
+            method,
+            tolerance,
+            max_iter,
+        ))
+        sci_name = _get_sci_name("gemseo_fp", key)
+        self._scilab_function = ScilabFunction.from_signature(
+            sci_name,
+            input_names,
+            output_names,
+            sci_def=self.__generate_sci_def(
+                sci_name,
+                functions,
+                input_names,
+                output_names,
+                method,
+                tolerance,
+                max_iter,
+            ),
+        )
+
+        super().__init__(name=name or "_".join(function_names))
+
+        self.io.input_grammar.update_from_names(input_names)
+        self.io.output_grammar.update_from_names(output_names)
+        self.io.input_grammar.defaults.update({
+            coupling_name: zeros(1) for coupling_name in self.coupling_names
+        })
+        self.io.data_processor = ScilabDataProcessor(self._scilab_function)
+
+    def __generate_sci_def(
+        self,
+        sci_name: str,
+        functions: Sequence[ScilabFunction],
+        input_names: Sequence[str],
+        output_names: Sequence[str],
+        method: Method,
+        tolerance: float,
+        max_iter: int,
+    ) -> str:
+        """Generate the Scilab definition of the fixed-point loop.
+
+        Args:
+            sci_name: The name of the Scilab function.
+            functions: The coupled scilab functions.
+            input_names: The names of the inputs.
+            output_names: The names of the outputs.
+            method: The fixed-point method.
+            tolerance: The tolerance on the relative residual
+                of the coupling variables.
+            max_iter: The maximum number of iterations.
+
+        Returns:
+            The Scilab definition of the fixed-point loop.
+        """
+        previous = {
+            name: f"{self.__PREVIOUS_PREFIX}{name}" for name in self.coupling_names
+        }
+        outs_form = ", ".join(output_names)
+        args_form = ", ".join(input_names)
+        lines = [
+            f"function [{outs_form}] = {sci_name}({args_form})",
+            f"  {self.RESIDUAL} = 0;",
+            f"  for {self.N_ITERATIONS} = 1:{max_iter}",
+        ]
+        lines.extend(f"    {previous[name]} = {name};" for name in self.coupling_names)
+        for function in functions:
+            if method == self.Method.JACOBI:
+                args = [previous.get(arg, arg) for arg in function.args]
+            else:
+                args = function.args
+
+            lines.append(
+                f"    [{', '.join(function.outs)}] = "
+                f"{function.name}({', '.join(args)});"
+            )
+
+        if self.coupling_names:
+            difference = " + ".join(
+                f'norm({name} - {previous[name]}, "fro")^2'
+                for name in self.coupling_names
+            )
+            norm = " + ".join(f'norm({name}, "fro")^2' for name in self.coupling_names)
+            lines.extend([
+                f"    {self.RESIDUAL} = sqrt({difference}) / max(sqrt({norm}), %eps);",
+                f"    if {self.RESIDUAL} <= {tolerance!r} then",
+                "      break;",
+                "    end",
+            ])
+        else:
+            lines.append("    break;")
+
+        lines.extend(["  end", "endfunction", ""])
+        return "\n".join(lines)
+
+    def _run(self, input_data: StrKeyMapping) -> StrKeyMapping | None:
+        """Run the discipline.
+
+        Raises:
+            BaseException: If the discipline execution fails.
+        """
+        try:
+            output_data = self._scilab_function(**input_data)
+        except BaseException:
+            LOGGER.exception("Discipline: %s execution failed", self.name)
+            raise
+
+        output_data = dict(zip(self._scilab_function.outs, output_data, strict=False))
+        if output_data[self.RESIDUAL] > self.__tolerance:
+            LOGGER.warning(
+                "Discipline: %s did not converge in %s iterations, residual: %s",
+                self.name,
+                output_data[self.N_ITERATIONS],
+                output_data[self.RESIDUAL],
+            )
+
+        return output_data
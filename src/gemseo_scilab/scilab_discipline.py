@@ -18,15 +18,28 @@ from __future__ import annotations
 
 import logging
 from typing import TYPE_CHECKING
+from typing import Any
+from typing import Final
 
+from gemseo.caches.simple_cache import SimpleCache
 from gemseo.core.discipline.data_processor import DataProcessor
 from gemseo.core.discipline.discipline import Discipline
 from numpy import array
+from numpy import eye
 from numpy import ndarray
+from numpy import zeros
 
+from gemseo_scilab.py_scilab import ScilabLazyOutput
+from gemseo_scilab.py_scilab import ScilabMemmap
 from gemseo_scilab.py_scilab import ScilabPackage
+from gemseo_scilab.recording import ScilabCallRecorder
+from gemseo_scilab.surrogate_fallback import SurrogateFallback
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+    from pathlib import Path
+
     from gemseo.typing import MutableStrKeyMapping
     from gemseo.typing import StrKeyMapping
 
@@ -38,10 +51,44 @@ LOGGER = logging.getLogger(__name__)
 class ScilabDiscipline(Discipline):
     """Base wrapper for OCCAM problem discipline wrappers and SimpleGrammar."""
 
+    COMPLEX_STEP: Final[float] = 1e-30
+    """The complex step to compute the Jacobian."""
+
+    required_output_names: tuple[str, ...]
+    """The names of the outputs to retrieve from Scilab at each execution.
+
+    The other outputs are kept in Scilab and returned as `ScilabLazyOutput` objects,
+    unless the cache of the discipline stores several entries,
+    e.g. an HDF5 cache,
+    as the cached outputs must remain available.
+    If empty, retrieve all the outputs.
+    """
+
+    memmap_threshold: int
+    """The number of elements of an output above which it is memory-mapped.
+
+    The output is written to a binary file by Scilab
+    and returned as a read-only `ScilabMemmap` paged in when accessed.
+    If 0, transfer all the outputs through `scilab2py`.
+    It cannot be used with `required_output_names`.
+    """
+
+    surrogate_fallback: SurrogateFallback | None
+    """The surrogate answering the calls when accurate enough, if any."""
+
+    __use_complex_step: bool
+
     def __init__(
         self,
         function_name: str,
         script_dir_path: str,
+        cache_file_path: str | Path = "",
+        record_file_path: str | Path = "",
+        surrogate_tolerance: float = 0.0,
+        surrogate_training_period: int = 10,
+        required_output_names: Sequence[str] = (),
+        use_complex_step: bool = False,
+        memmap_threshold: int = 0,
     ) -> None:
         """Constructor.
 
@@ -49,11 +96,71 @@ class ScilabDiscipline(Discipline):
             function_name: The name of the scilab function to
                 generate the discipline from.
             script_dir_path: The path to the directory to scan for `.sci` files.
+            cache_file_path: The path to the HDF file
+                used to persist the evaluations of the function between runs.
+                The cache node is named after the function
+                and the hash of its `.sci` file,
+                so that a change of the Scilab source invalidates the cached data.
+                If empty, use the default in-memory cache of the discipline.
+                It cannot be used with `surrogate_tolerance`.
+            record_file_path: The path to the file
+                to append the inputs, outputs and durations of the Scilab calls to,
+                to be replayed with `replay`.
+                The outputs kept in Scilab because of `required_output_names`
+                are not recorded,
+                nor are the calls computing the Jacobian by complex step.
+                If empty, do not record the calls.
+            surrogate_tolerance: The tolerance on the standard deviation
+                of a Gaussian process surrogate trained on the past calls,
+                relative to the range of the outputs,
+                below which the surrogate answers a call instead of Scilab.
+                If 0, always call Scilab.
+                As the answers of the surrogate are cached as Scilab evaluations,
+                it cannot be used with `cache_file_path`
+                nor with a cache storing several entries.
+                As the surrogate is trained on all the outputs,
+                it cannot be used with `required_output_names`.
+            surrogate_training_period: The number of Scilab calls
+                between two trainings of the surrogate.
+            required_output_names: The names of the outputs
+                to retrieve from Scilab at each execution;
+                the other ones are retrieved on demand,
+                unless the cache of the discipline stores several entries.
+                If empty, retrieve all the outputs.
+                It cannot be used with `surrogate_tolerance`.
+            use_complex_step: Whether to compute the Jacobian by complex step,
+                evaluating all the perturbations in a single Scilab call.
+                The Scilab function must be complex-step compatible.
+            memmap_threshold: The number of elements of an output
+                above which it is written to a binary file by Scilab
+                and returned as a read-only `ScilabMemmap` paged in when accessed;
+                the file is removed when the output is released,
+                e.g. by the cache of the discipline.
+                If 0, transfer all the outputs through `scilab2py`.
+                It cannot be used with `required_output_names`.
 
         Raises:
             ValueError: If the function is not in any of the files of
                 the `script_dir_path`.
+                If both `required_output_names` and `memmap_threshold` are set.
+                If both `surrogate_tolerance` and `cache_file_path` are set.
+                If both `required_output_names` and `surrogate_tolerance` are set.
+                If `required_output_names` are not outputs of the function.
         """
+        if required_output_names and memmap_threshold:
+            msg = "required_output_names and memmap_threshold cannot be used together."
+            raise ValueError(msg)
+
+        if surrogate_tolerance and cache_file_path:
+            msg = "surrogate_tolerance and cache_file_path cannot be used together."
+            raise ValueError(msg)
+
+        if required_output_names and surrogate_tolerance:
+            msg = (
+                "required_output_names and surrogate_tolerance cannot be used together."
+            )
+            raise ValueError(msg)
+
         self.__scilab_package = ScilabPackage(script_dir_path)
 
         if function_name not in self.__scilab_package.functions:
@@ -64,12 +171,82 @@ class ScilabDiscipline(Discipline):
             raise ValueError(msg)
 
         self._scilab_function = self.__scilab_package.functions[function_name]
+        unknown_names = set(required_output_names).difference(
+            self._scilab_function.outs
+        )
+        if unknown_names:
+            msg = (
+                f"The required outputs {', '.join(sorted(unknown_names))} "
+                f"are not outputs of {function_name}: "
+                f"{', '.join(self._scilab_function.outs)}."
+            )
+            raise ValueError(msg)
+
+        self.required_output_names = tuple(required_output_names)
+        self.__use_complex_step = use_complex_step
+        self.memmap_threshold = memmap_threshold
+        if surrogate_tolerance:
+            self.surrogate_fallback = SurrogateFallback(
+                self._scilab_function.args,
+                self._scilab_function.outs,
+                surrogate_tolerance,
+                surrogate_training_period,
+            )
+        else:
+            self.surrogate_fallback = None
 
         super().__init__(name=function_name)
 
         self.io.input_grammar.update_from_names(self._scilab_function.args)
         self.io.output_grammar.update_from_names(self._scilab_function.outs)
+        if self.required_output_names:
+            # The outputs kept in Scilab are ScilabLazyOutput objects and not arrays.
+            self.io.output_grammar.update_from_types({
+                output_name: None
+                for output_name in self._scilab_function.outs
+                if output_name not in self.required_output_names
+            })
+
         self.io.data_processor = ScilabDataProcessor(self._scilab_function)
+        if record_file_path:
+            self._scilab_function.recorder = ScilabCallRecorder(record_file_path)
+
+        if cache_file_path:
+            self.set_cache(
+                self.CacheType.HDF5,
+                hdf_file_path=cache_file_path,
+                hdf_node_path=f"{function_name}_{self._scilab_function.source_hash}",
+            )
+
+    def set_cache(
+        self,
+        cache_type: Discipline.CacheType,
+        tolerance: float = 0.0,
+        **kwargs: Any,
+    ) -> None:
+        """Set the type of cache to use and the tolerance level.
+
+        Args:
+            cache_type: The type of cache.
+            tolerance: The cache tolerance.
+            **kwargs: The other arguments passed to `CacheFactory.create`.
+
+        Raises:
+            ValueError: If the cache stores several entries
+                while the discipline has a surrogate fallback,
+                whose answers would be cached as Scilab evaluations.
+        """
+        if self.surrogate_fallback is not None and cache_type not in {
+            self.CacheType.NONE,
+            self.CacheType.SIMPLE,
+        }:
+            msg = (
+                "A surrogate fallback cannot be used with a cache "
+                f"storing several entries; got {cache_type}."
+            )
+            raise ValueError(msg)
+
+        super().set_cache(cache_type, tolerance=tolerance, **kwargs)
 
     def _run(self, input_data: StrKeyMapping) -> StrKeyMapping | None:
         """Run the discipline.
@@ -77,17 +254,78 @@ class ScilabDiscipline(Discipline):
         Raises:
             BaseException: If the discipline execution fails.
         """
+        if self.surrogate_fallback is not None:
+            output_data = self.surrogate_fallback.predict(input_data)
+            if output_data is not None:
+                return output_data
+
+        # The outputs kept in Scilab would not remain available in a full cache.
+        if self.required_output_names and (
+            self.cache is None or isinstance(self.cache, SimpleCache)
+        ):
+            output_names = self.required_output_names
+        else:
+            output_names = self._scilab_function.outs
+
         try:
-            output_data = self._scilab_function(**input_data)
+            if self.memmap_threshold:
+                output_data = self._scilab_function.call_with_memmaps(
+                    self.memmap_threshold, **input_data
+                )
+            else:
+                output_data = self._scilab_function.call_with_outputs(
+                    output_names, **input_data
+                )
         except BaseException:
             LOGGER.exception("Discipline: %s execution failed", self.name)
             raise
 
-        out_names = self._scilab_function.outs
+        if self.surrogate_fallback is not None:
+            self.surrogate_fallback.add_sample(input_data, output_data)
+
+        return output_data
+
+    def _compute_jacobian(
+        self,
+        input_names: Iterable[str] = (),
+        output_names: Iterable[str] = (),
+    ) -> None:
+        if not self.__use_complex_step:
+            super()._compute_jacobian(input_names, output_names)
+            return
+
+        input_names, output_names = self._init_jacobian(input_names, output_names)
+        input_data = self.io.data
+        # One perturbation, i.e. one column of the arguments, per input component.
+        slices = {}
+        start = 0
+        for input_name in input_names:
+            end = start + input_data[input_name].size
+            slices[input_name] = slice(start, end)
+            start = end
+
+        perturbed_args = []
+        for arg in self._scilab_function.args:
+            value = input_data[arg].ravel()[:, None]
+            if arg in slices:
+                perturbed_arg = zeros((value.size, start), dtype=complex)
+                perturbed_arg += value
+                perturbed_arg[:, slices[arg]] += (
+                    1j * self.COMPLEX_STEP * eye(value.size)
+                )
+            else:
+                # scilab2py would add an imaginary part to a complex value
+                # whose imaginary part is zero.
+                perturbed_arg = value
+
+            perturbed_args.append(perturbed_arg)
 
-        if len(out_names) == 1:
-            return {out_names[0]: output_data}
-        return dict(zip(out_names, output_data, strict=False))
+        derivatives = self._scilab_function.complex_step_call(
+            *perturbed_args, step=self.COMPLEX_STEP
+        )
+        for output_name in output_names:
+            for input_name, columns in slices.items():
+                self.jac[output_name][input_name] = derivatives[output_name][:, columns]
 
 
 class ScilabDataProcessor(DataProcessor):
@@ -110,8 +348,11 @@ class ScilabDataProcessor(DataProcessor):
         for data_name in self.__scilab_function.outs:
             val = processed_data[data_name]
 
+            if isinstance(val, (ScilabLazyOutput, ScilabMemmap)):
+                continue
+
             if isinstance(val, ndarray):
-                processed_data[data_name] = val.flatten()
+                processed_data[data_name] = val.ravel()
             else:
                 processed_data[data_name] = array([val])
 
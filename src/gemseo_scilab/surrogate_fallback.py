@@ -0,0 +1,166 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Surrogate fallback trained on the call history of a Scilab discipline."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from gemseo.datasets.io_dataset import IODataset
+from gemseo.mlearning.regression.algos.gpr import GaussianProcessRegressor
+from numpy import array
+from numpy import atleast_1d
+from numpy import concatenate
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from gemseo.typing import StrKeyMapping
+    from numpy import ndarray
+
+LOGGER = logging.getLogger(__name__)
+
+
+class SurrogateFallback:
+    """A Gaussian process surrogate answering the calls when accurate enough.
+
+    The surrogate is trained incrementally on the inputs and outputs of the calls
+    and answers a new call
+    when its standard deviation is lower than a tolerance for all the outputs.
+    As the outputs are scaled to [0, 1] for the training,
+    the tolerance is relative to the range of the outputs in the training data.
+    """
+
+    __input_names: Sequence[str]
+    __output_names: Sequence[str]
+    __tolerance: float
+    __training_period: int
+    __input_samples: list[ndarray]
+    __output_samples: list[ndarray]
+    __names_to_sizes: dict[str, int]
+    __model: GaussianProcessRegressor | None
+    __n_calls: int
+    __n_surrogate_calls: int
+
+    def __init__(
+        self,
+        input_names: Sequence[str],
+        output_names: Sequence[str],
+        tolerance: float,
+        training_period: int = 10,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            input_names: The names of the inputs.
+            output_names: The names of the outputs.
+            tolerance: The tolerance on the standard deviation of the surrogate
+                to answer a call.
+            training_period: The number of new samples between two trainings.
+        """
+        self.__input_names = input_names
+        self.__output_names = output_names
+        self.__tolerance = tolerance
+        self.__training_period = training_period
+        self.__input_samples = []
+        self.__output_samples = []
+        self.__names_to_sizes = {}
+        self.__model = None
+        self.__n_calls = 0
+        self.__n_surrogate_calls = 0
+
+    @property
+    def n_calls(self) -> int:
+        """The number of calls."""
+        return self.__n_calls
+
+    @property
+    def n_surrogate_calls(self) -> int:
+        """The number of calls answered by the surrogate."""
+        return self.__n_surrogate_calls
+
+    @property
+    def usage_ratio(self) -> float:
+        """The fraction of the calls answered by the surrogate."""
+        if not self.__n_calls:
+            return 0.0
+
+        return self.__n_surrogate_calls / self.__n_calls
+
+    def predict(self, input_data: StrKeyMapping) -> dict[str, ndarray] | None:
+        """Predict the outputs if the surrogate is accurate enough.
+
+        Args:
+            input_data: The input data.
+
+        Returns:
+            The output data if the surrogate is accurate enough, otherwise `None`.
+        """
+        self.__n_calls += 1
+        if self.__model is None:
+            return None
+
+        input_data = {name: atleast_1d(input_data[name]) for name in self.__input_names}
+        if self.__model.predict_std(input_data).max() > self.__tolerance:
+            return None
+
+        self.__n_surrogate_calls += 1
+        return self.__model.predict(input_data)
+
+    def add_sample(self, input_data: StrKeyMapping, output_data: StrKeyMapping) -> None:
+        """Add a sample and train the surrogate periodically.
+
+        Args:
+            input_data: The input data.
+            output_data: The output data.
+        """
+        inputs = [atleast_1d(input_data[name]).ravel() for name in self.__input_names]
+        outputs = [
+            atleast_1d(output_data[name]).ravel() for name in self.__output_names
+        ]
+        if not self.__names_to_sizes:
+            self.__names_to_sizes = {
+                name: value.size
+                for name, value in zip(
+                    [*self.__input_names, *self.__output_names],
+                    inputs + outputs,
+                    strict=False,
+                )
+            }
+
+        self.__input_samples.append(concatenate(inputs))
+        self.__output_samples.append(concatenate(outputs))
+        if len(self.__input_samples) % self.__training_period == 0:
+            self.__train()
+
+    def __train(self) -> None:
+        """Train the surrogate from the samples."""
+        LOGGER.debug(
+            "Training the surrogate fallback with %s samples",
+            len(self.__input_samples),
+        )
+        dataset = IODataset()
+        dataset.add_input_group(
+            array(self.__input_samples), list(self.__input_names), self.__names_to_sizes
+        )
+        dataset.add_output_group(
+            array(self.__output_samples),
+            list(self.__output_names),
+            self.__names_to_sizes,
+        )
+        model = GaussianProcessRegressor(dataset)
+        model.learn()
+        self.__model = model
@@ -16,10 +16,17 @@
 
 from __future__ import annotations
 
+import shutil
+import sys
 from pathlib import Path
 
 import pytest
+from numpy import array
+from numpy import newaxis
+from numpy.testing import assert_allclose
 
+from gemseo_scilab import py_scilab
+from gemseo_scilab.py_scilab import ENGINE
 from gemseo_scilab.py_scilab import ScilabPackage
 
 DIRNAME = Path(__file__).parent / "sci"
@@ -88,3 +95,165 @@ def test_str_representation():
         "    arguments: b\n"
         "    outputs: a\n    "
     )
+
+
+def test_package_loaded_once(monkeypatch):
+    """Test that the functions of a directory are loaded once per process."""
+    ScilabPackage(DIRNAME / "dummy_func")
+    assert DIRNAME / "dummy_func" in ENGINE.script_dir_paths
+
+    loaded_paths = []
+    monkeypatch.setattr(py_scilab.scilab, "getd", loaded_paths.append)
+    ScilabPackage(DIRNAME / "dummy_func")
+    assert not loaded_paths
+
+
+def test_package_reloaded_on_change(tmp_wd):
+    """Test that the functions of a directory are reloaded when a file changes.
+
+    Args:
+        tmp_wd: Fixture to move into a temporary work directory.
+    """
+    script_dir_path = tmp_wd / "sci"
+    shutil.copytree(DIRNAME / "dummy_func", script_dir_path)
+    assert ScilabPackage(script_dir_path).functions["dummy_func1"](1.0) == 3.0
+
+    source_file_path = script_dir_path / "dummy_package.sci"
+    source_file_path.write_text(
+        source_file_path.read_text().replace("a = 3.0*b", "a = 4.0*b")
+    )
+    assert ScilabPackage(script_dir_path).functions["dummy_func1"](1.0) == 4.0
+
+
+def test_profiling():
+    """Test the Scilab profiling report of the functions of a package."""
+    package = ScilabPackage(DIRNAME / "dummy_func", profile=True)
+    assert package.is_profiling
+    package.functions["dummy_func2"](1.0, 2.0, 3.0)
+
+    report = package.get_profiling_report()
+    assert set(report) == set(package.functions)
+    profile = report["dummy_func2"]
+    assert profile.n_calls == 1
+    assert profile.line_counts.shape == profile.line_times.shape
+    assert profile.total_time >= 0.0
+    assert report["dummy_func1"].n_calls == 0
+
+    package.disable_profiling()
+    with pytest.raises(RuntimeError, match="The Scilab profiling is not enabled"):
+        package.get_profiling_report()
+
+
+@pytest.mark.parametrize("period_name", ["clear_period", "restart_period"])
+def test_engine_recycling(monkeypatch, period_name):
+    """Test that the functions are still available after recycling the engine.
+
+    Args:
+        period_name: The name of the recycling period.
+    """
+    function = ScilabPackage(DIRNAME / "dummy_func").functions["dummy_func1"]
+    monkeypatch.setattr(ENGINE, period_name, 2)
+    ENGINE.restart()
+    for _ in range(5):
+        assert function(1.0) == 3.0
+
+    assert ENGINE.n_calls == (1 if period_name == "restart_period" else 5)
+    if sys.platform.startswith("linux"):
+        # The resident memory is read from /proc.
+        assert ENGINE.rss > 0
+
+
+@pytest.mark.parametrize("recycle", [ENGINE.clear, ENGINE.restart])
+def test_recycling_after_change(tmp_wd, caplog, recycle):
+    """Test that recycling the engine reloads the functions as they were loaded.
+
+    Args:
+        tmp_wd: Fixture to move into a temporary work directory.
+        caplog: Fixture to access and control log capturing.
+        recycle: The method recycling the engine.
+    """
+    script_dir_path = tmp_wd / "sci"
+    shutil.copytree(DIRNAME / "dummy_func", script_dir_path)
+    function = ScilabPackage(script_dir_path).functions["dummy_func1"]
+
+    source_file_path = script_dir_path / "dummy_package.sci"
+    source_file_path.write_text(
+        source_file_path.read_text().replace("a = 3.0*b", "a = 4.0*b")
+    )
+    recycle()
+    assert function(1.0) == 3.0
+    assert "has changed since it was loaded" in caplog.text
+
+
+@pytest.mark.parametrize("recycle", [ENGINE.clear, ENGINE.restart])
+def test_profiling_after_recycling(recycle):
+    """Test that the profiling is enabled again after recycling the engine.
+
+    Args:
+        recycle: The method recycling the engine.
+    """
+    package = ScilabPackage(DIRNAME / "dummy_func", profile=True)
+    recycle()
+    package.functions["dummy_func2"](1.0, 2.0, 3.0)
+    assert package.get_profiling_report()["dummy_func2"].n_calls == 1
+    package.disable_profiling()
+
+
+def test_engine_max_rss(monkeypatch):
+    """Test that the engine restarts when the Scilab process uses too much memory."""
+    function = ScilabPackage(DIRNAME / "dummy_func").functions["dummy_func1"]
+    function(1.0)
+    monkeypatch.setattr(ENGINE, "max_rss", 1)
+    assert function(1.0) == 3.0
+    assert ENGINE.n_calls == 1
+
+
+@pytest.mark.parametrize(("n_workers", "chunk_size"), [(0, 0), (2, 1)])
+def test_batch_call(n_workers, chunk_size):
+    """Test the evaluation of a batch of samples with parallel_run.
+
+    Args:
+        n_workers: The number of Scilab workers.
+        chunk_size: The number of samples sent to a worker at once.
+    """
+    function = ScilabPackage(DIRNAME / "dummy_func").functions["dummy_func2"]
+    d = array([1.0, 2.0, 3.0, 4.0])
+    e = array([[0.5], [1.5], [2.5], [3.5]])
+    f = array([0.0, 1.0, 0.0, 1.0])
+    outputs = function.batch_call(d, e, f, n_workers=n_workers, chunk_size=chunk_size)
+
+    assert_allclose(outputs["a"], 3 * d[:, newaxis])
+    assert_allclose(outputs["b"], 5 * d[:, newaxis] + e)
+    assert_allclose(outputs["c"], 6 * f[:, newaxis] + 2)
+
+
+def test_batch_call_matrix_output():
+    """Test that the outputs of a batch are flattened as in a standard call."""
+    function = ScilabPackage(DIRNAME / "dummy_func").functions["dummy_func5"]
+    b = array([1.0, 2.0, 3.0])
+    outputs = function.batch_call(b)
+    assert_allclose(outputs["a"], 3 * b[:, newaxis].repeat(2, axis=1))
+
+
+@pytest.mark.parametrize("output_names", [[], ["a", "toto"]])
+def test_call_with_outputs_error(output_names):
+    """Test that an error is raised when the outputs to retrieve are invalid.
+
+    Args:
+        output_names: The names of the outputs to retrieve.
+    """
+    function = ScilabPackage(DIRNAME / "dummy_func").functions["dummy_func2"]
+    with pytest.raises(ValueError, match="must be a non-empty subset of a, b, c"):
+        function.call_with_outputs(output_names, 1.0, 2.0, 3.0)
+
+
+def test_call_with_outputs():
+    """Test the retrieval of some outputs only."""
+    function = ScilabPackage(DIRNAME / "dummy_func").functions["dummy_func2"]
+    output_data = function.call_with_outputs(["a", "c"], 1.0, 2.0, 3.0)
+    assert output_data["a"] == 3.0
+    assert output_data["c"] == 20.0
+    assert output_data["b"].value == 7.0
+
+    output_data = function.call_with_outputs(["a", "b", "c"], 1.0, 2.0, 3.0)
+    assert output_data == {"a": 3.0, "b": 7.0, "c": 20.0}
@@ -0,0 +1,100 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests for the record and replay of Scilab function calls."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from numpy import array
+
+from gemseo_scilab.py_scilab import ScilabPackage
+from gemseo_scilab.recording import ScilabCallRecorder
+from gemseo_scilab.recording import read_records
+from gemseo_scilab.recording import replay
+from gemseo_scilab.scilab_discipline import ScilabDiscipline
+
+DIRNAME = Path(__file__).parent / "sci/dummy_func"
+
+
+def test_record_discipline(tmp_wd):
+    """Test the record of the calls of a discipline.
+
+    Args:
+        tmp_wd: Fixture to move into a temporary work directory.
+    """
+    disc = ScilabDiscipline("dummy_func1", DIRNAME, record_file_path="calls.pck")
+    for b in [1.0, 2.0]:
+        disc.execute({"b": array([b])})
+
+    records = list(read_records("calls.pck"))
+    assert [record.function_name for record in records] == ["dummy_func1"] * 2
+    assert records[1].inputs["b"] == array([2.0])
+    assert records[1].outputs["a"] == 6.0
+    assert records[1].duration > 0.0
+
+
+@pytest.mark.parametrize(
+    ("options", "output_names"),
+    [
+        ({"required_output_names": ["b"]}, ["b"]),
+        ({"memmap_threshold": 1}, ["a", "b", "c"]),
+    ],
+)
+def test_record_discipline_options(tmp_wd, options, output_names):
+    """Test the record and replay of the calls of a discipline with options.
+
+    Args:
+        tmp_wd: Fixture to move into a temporary work directory.
+        options: The options of the discipline.
+        output_names: The names of the recorded outputs.
+    """
+    disc = ScilabDiscipline(
+        "dummy_func2", DIRNAME, record_file_path="calls.pck", **options
+    )
+    disc.execute({"d": array([1.0]), "e": array([2.0]), "f": array([3.0])})
+
+    (record,) = read_records("calls.pck")
+    assert record.function_name == "dummy_func2"
+    assert sorted(record.outputs) == output_names
+    assert record.outputs["b"] == 7.0
+
+    report = replay("calls.pck", ScilabPackage(DIRNAME).functions)
+    assert report.max_differences == {"dummy_func2": dict.fromkeys(output_names, 0.0)}
+
+
+def test_replay(tmp_wd):
+    """Test the replay of recorded calls.
+
+    Args:
+        tmp_wd: Fixture to move into a temporary work directory.
+    """
+    package = ScilabPackage(DIRNAME)
+    function = package.functions["dummy_func2"]
+    function.recorder = ScilabCallRecorder("calls.pck")
+    function(1.0, 2.0, 3.0)
+    function(d=2.0, e=3.0, f=4.0)
+    function.recorder = None
+
+    report = replay("calls.pck", package.functions)
+    assert report.durations["dummy_func2"].shape == (2,)
+    assert report.recorded_durations["dummy_func2"].shape == (2,)
+    assert report.max_differences == {"dummy_func2": {"a": 0.0, "b": 0.0, "c": 0.0}}
+    replayed, recorded = report.get_duration_quantiles((0.5,))["dummy_func2"]
+    assert replayed.shape == recorded.shape == (1,)
+
+    with pytest.raises(KeyError, match="The recorded function dummy_func2"):
+        replay("calls.pck", {})
@@ -0,0 +1,67 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests for the scheduler of Scilab function calls."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from gemseo_scilab.py_scilab import ScilabPackage
+from gemseo_scilab.scheduler import ScilabScheduler
+
+DIRNAME = Path(__file__).parent / "sci/scheduler"
+
+
+def test_scheduler():
+    """Test the execution of calls over several engines and the metrics."""
+    functions = ScilabPackage(DIRNAME).functions
+    with ScilabScheduler(DIRNAME, n_engines=2) as scheduler:
+        futures = [
+            scheduler.submit(functions["fast_func"], float(b)) for b in range(4)
+        ] + [scheduler.submit(functions["slow_func"], b=1.0)]
+        assert [future.result() for future in futures] == [0.0, 2.0, 4.0, 6.0, 3.0]
+        assert scheduler.queue_depth == 0
+        assert 0 < scheduler.utilization <= 1
+        costs = scheduler.costs
+        assert costs["slow_func"] > costs["fast_func"]
+
+
+def test_longest_first():
+    """Test that the queued calls with the highest costs are executed first."""
+    functions = ScilabPackage(DIRNAME).functions
+    fast_func = functions["fast_func"]
+    slow_func = functions["slow_func"]
+    with ScilabScheduler(DIRNAME, n_engines=1) as scheduler:
+        scheduler.submit(fast_func, 1.0).result()
+        scheduler.submit(slow_func, 1.0).result()
+
+        names = []
+        scheduler.submit(slow_func, 1.0)
+        for function in [fast_func, slow_func]:
+            scheduler.submit(function, 1.0).add_done_callback(
+                lambda _, name=function.name: names.append(name)
+            )
+
+    assert names == ["slow_func", "fast_func"]
+
+
+def test_shutdown():
+    """Test that a call cannot be submitted after the shutdown."""
+    scheduler = ScilabScheduler(DIRNAME, n_engines=1)
+    scheduler.shutdown()
+    with pytest.raises(RuntimeError, match="shut down"):
+        scheduler.submit(ScilabPackage(DIRNAME).functions["fast_func"], 1.0)
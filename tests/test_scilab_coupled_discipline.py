@@ -0,0 +1,78 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests for the scilab coupled discipline."""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import pytest
+from numpy import array
+from numpy.testing import assert_allclose
+
+from gemseo_scilab.scilab_coupled_discipline import ScilabCoupledDiscipline
+
+DIRNAME = Path(__file__).parent / "sci/coupled"
+FUNCTION_NAMES = ["coupled_func1", "coupled_func2"]
+
+
+@pytest.mark.parametrize("method", ScilabCoupledDiscipline.Method)
+def test_fixed_point(method):
+    """Test the resolution of the couplings in Scilab.
+
+    Args:
+        method: The fixed-point method.
+    """
+    disc = ScilabCoupledDiscipline(
+        FUNCTION_NAMES, DIRNAME, method=method, tolerance=1e-12, max_iter=100
+    )
+    assert disc.coupling_names == ("y1", "y2")
+    assert set(disc.io.input_grammar) == {"x", "y1", "y2"}
+    assert set(disc.io.output_grammar) == {
+        "y1",
+        "y2",
+        "z",
+        disc.N_ITERATIONS,
+        disc.RESIDUAL,
+    }
+
+    out = disc.execute({"x": array([0.9])})
+    assert_allclose(out["y1"], array([1.0]))
+    assert_allclose(out["y2"], array([0.5]))
+    assert_allclose(out["z"], array([1.0]))
+    assert 1 < out[disc.N_ITERATIONS][0] < 100
+    assert out[disc.RESIDUAL][0] <= 1e-12
+
+
+def test_not_converged(caplog):
+    """Test that a warning is logged when the fixed-point loop does not converge.
+
+    Args:
+        caplog: Fixture to capture log messages.
+    """
+    caplog.set_level(logging.WARNING)
+    disc = ScilabCoupledDiscipline(FUNCTION_NAMES, DIRNAME, max_iter=2)
+    out = disc.execute({"x": array([0.9])})
+    assert out[disc.N_ITERATIONS][0] == 2
+    assert "did not converge in 2 iterations" in caplog.text
+
+
+def test_func_not_in_dir():
+    """Test that an error is raised when a function is not in the given path."""
+    with pytest.raises(
+        ValueError, match=r"The function named toto is not in script_dir .*"
+    ):
+        ScilabCoupledDiscipline(["coupled_func1", "toto"], DIRNAME)
@@ -18,15 +18,23 @@ from __future__ import annotations
 
 import logging
 import pickle
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 from gemseo import to_pickle
 from numpy import array
+from numpy import asarray
+from numpy.testing import assert_allclose
 from scilab2py import Scilab2PyError
 
+from gemseo_scilab.py_scilab import ENGINE
+from gemseo_scilab.py_scilab import ScilabLazyOutput
+from gemseo_scilab.py_scilab import ScilabMemmap
 from gemseo_scilab.py_scilab import ScilabPackage
+from gemseo_scilab.py_scilab import initialize_worker
 from gemseo_scilab.scilab_discipline import ScilabDiscipline
 
 if TYPE_CHECKING:
@@ -114,6 +122,219 @@ def test_pickle(tmp_wd):
     assert (out["a"] == out_ref["a"]).all()
 
 
+def _execute_dummy_func1(disc: ScilabDiscipline, b: float) -> ndarray:
+    """Execute a discipline wrapping ``dummy_func1`` in a worker process.
+
+    Args:
+        disc: The discipline.
+        b: The value of the input.
+
+    Returns:
+        The value of the output.
+    """
+    return disc.execute({"b": array([b])})["a"]
+
+
+def test_process_pool():
+    """Test the execution of a ScilabDiscipline in a pool of warm workers."""
+    disc = ScilabDiscipline("dummy_func1", DIRNAME)
+    inputs = [1.0, 2.0, 3.0, 4.0]
+    with ProcessPoolExecutor(
+        max_workers=2, initializer=initialize_worker, initargs=(DIRNAME,)
+    ) as executor:
+        outputs = list(executor.map(_execute_dummy_func1, [disc] * 4, inputs))
+
+    for b, a in zip(inputs, outputs, strict=True):
+        assert a == array([3.0 * b])
+
+
+def test_persistent_cache(tmp_wd):
+    """Test the persistent cache and its invalidation on a change of the source.
+
+    Args:
+        tmp_wd: Fixture to move into a temporary work directory.
+    """
+    script_dir_path = tmp_wd / "sci"
+    shutil.copytree(DIRNAME, script_dir_path)
+    cache_file_path = tmp_wd / "cache.h5"
+    disc = ScilabDiscipline("dummy_func1", script_dir_path, cache_file_path)
+    disc.execute({"b": array([1.0])})
+
+    disc = ScilabDiscipline("dummy_func1", script_dir_path, cache_file_path)
+    assert len(disc.cache) == 1
+
+    source_file_path = script_dir_path / "dummy_package.sci"
+    source_file_path.write_text(
+        source_file_path.read_text().replace("a = 3.0*b", "a = 4.0*b")
+    )
+    disc = ScilabDiscipline("dummy_func1", script_dir_path, cache_file_path)
+    assert len(disc.cache) == 0
+    out = disc.execute({"b": array([1.0])})
+    assert_allclose(out["a"], array([4.0]))
+
+    disc = ScilabDiscipline("dummy_func1", script_dir_path, cache_file_path)
+    assert len(disc.cache) == 1
+    assert_allclose(disc.cache.last_entry.outputs["a"], array([4.0]))
+
+
+def test_surrogate_fallback():
+    """Test that the surrogate answers the calls in a well-sampled region."""
+    disc = ScilabDiscipline(
+        "dummy_func1",
+        DIRNAME,
+        surrogate_tolerance=1e-2,
+        surrogate_training_period=5,
+    )
+    for b in [0.0, 0.25, 0.5, 0.75, 1.0]:
+        disc.execute({"b": array([b])})
+
+    out = disc.execute({"b": array([0.6])})
+    assert abs(out["a"][0] - 1.8) < 1e-1
+    assert disc.surrogate_fallback.n_surrogate_calls == 1
+    assert disc.surrogate_fallback.usage_ratio == 1 / 6
+
+
+def test_surrogate_fallback_full_cache(tmp_wd):
+    """Test that the surrogate fallback cannot be used with a full cache.
+
+    Args:
+        tmp_wd: Fixture to move into a temporary work directory.
+    """
+    with pytest.raises(ValueError, match="cannot be used together"):
+        ScilabDiscipline(
+            "dummy_func1",
+            DIRNAME,
+            cache_file_path=tmp_wd / "cache.h5",
+            surrogate_tolerance=1e-2,
+        )
+
+    disc = ScilabDiscipline("dummy_func1", DIRNAME, surrogate_tolerance=1e-2)
+    with pytest.raises(ValueError, match="cache storing several entries"):
+        disc.set_cache(disc.CacheType.MEMORY_FULL)
+
+
+def test_required_outputs():
+    """Test that the outputs not required are retrieved from Scilab on demand."""
+    disc = ScilabDiscipline("dummy_func2", DIRNAME, required_output_names=["b"])
+    assert disc.validate_output_data
+    out = disc.execute({"d": array([1.0]), "e": array([2.0]), "f": array([3.0])})
+    assert out["b"] == array([7.0])
+    assert isinstance(out["a"], ScilabLazyOutput)
+    assert isinstance(out["c"], ScilabLazyOutput)
+    assert asarray(out["c"]) == array([20.0])
+
+    lazy_a = out["a"]
+    disc.execute({"d": array([2.0]), "e": array([2.0]), "f": array([3.0])})
+    with pytest.raises(RuntimeError, match="no longer available in Scilab"):
+        asarray(lazy_a)
+
+
+def test_required_outputs_errors():
+    """Test the errors raised by the required outputs."""
+    with pytest.raises(ValueError, match="are not outputs of dummy_func2"):
+        ScilabDiscipline("dummy_func2", DIRNAME, required_output_names=["g"])
+
+    with pytest.raises(ValueError, match="cannot be used together"):
+        ScilabDiscipline(
+            "dummy_func2",
+            DIRNAME,
+            required_output_names=["b"],
+            surrogate_tolerance=1e-2,
+        )
+
+
+def test_required_outputs_shared_function():
+    """Test the outputs kept in Scilab by disciplines wrapping the same function."""
+    disc_1 = ScilabDiscipline("dummy_func2", DIRNAME, required_output_names=["b"])
+    disc_2 = ScilabDiscipline("dummy_func2", DIRNAME, required_output_names=["b"])
+    out_1 = disc_1.execute({"d": array([1.0]), "e": array([2.0]), "f": array([3.0])})
+    out_2 = disc_2.execute({"d": array([2.0]), "e": array([2.0]), "f": array([3.0])})
+    assert_allclose(asarray(out_2["a"]), array([6.0]))
+    with pytest.raises(RuntimeError, match="no longer available in Scilab"):
+        asarray(out_1["a"])
+
+
+def test_required_outputs_recycling(monkeypatch):
+    """Test the outputs kept in Scilab when the Scilab session is recycled."""
+    disc = ScilabDiscipline("dummy_func2", DIRNAME, required_output_names=["b"])
+    monkeypatch.setattr(ENGINE, "restart_period", 1)
+    out = disc.execute({"d": array([1.0]), "e": array([2.0]), "f": array([3.0])})
+    # The retrieval is not a call that can restart the Scilab session.
+    assert_allclose(asarray(out["a"]), array([3.0]))
+
+    out = disc.execute({"d": array([2.0]), "e": array([2.0]), "f": array([3.0])})
+    ENGINE.restart()
+    with pytest.raises(RuntimeError, match="no longer available in Scilab"):
+        asarray(out["a"])
+
+
+def test_required_outputs_full_cache():
+    """Test that all the outputs are retrieved with a full cache."""
+    disc = ScilabDiscipline("dummy_func2", DIRNAME, required_output_names=["b"])
+    disc.set_cache(disc.CacheType.MEMORY_FULL)
+    out = disc.execute({"d": array([1.0]), "e": array([2.0]), "f": array([3.0])})
+    assert_allclose(out["a"], array([3.0]))
+    assert_allclose(disc.cache.last_entry.outputs["c"], array([20.0]))
+
+
+def test_complex_step_jacobian():
+    """Test the Jacobian computed by complex step in a single Scilab call."""
+    disc = ScilabDiscipline("dummy_func2", DIRNAME, use_complex_step=True)
+    jac = disc.linearize(
+        {"d": array([1.0]), "e": array([2.0]), "f": array([3.0])},
+        compute_all_jacobians=True,
+    )
+    assert_allclose(jac["a"]["d"], array([[3.0]]))
+    assert_allclose(jac["a"]["e"], array([[0.0]]))
+    assert_allclose(jac["b"]["d"], array([[5.0]]))
+    assert_allclose(jac["b"]["e"], array([[1.0]]))
+    assert_allclose(jac["c"]["f"], array([[6.0]]))
+
+
+def test_complex_step_jacobian_some_inputs():
+    """Test the Jacobian computed by complex step with respect to some inputs."""
+    disc = ScilabDiscipline("dummy_func2", DIRNAME, use_complex_step=True)
+    disc.add_differentiated_inputs(["d"])
+    disc.add_differentiated_outputs(["a", "b", "c"])
+    jac = disc.linearize({"d": array([1.0]), "e": array([2.0]), "f": array([3.0])})
+    assert set(jac["b"]) == {"d"}
+    assert_allclose(jac["a"]["d"], array([[3.0]]))
+    assert_allclose(jac["b"]["d"], array([[5.0]]))
+    assert_allclose(jac["c"]["d"], array([[0.0]]))
+
+
+def test_complex_step_jacobian_matrix_output():
+    """Test the order of the rows of the Jacobian of a matrix output."""
+    disc = ScilabDiscipline("dummy_func6", DIRNAME, use_complex_step=True)
+    jac = disc.linearize({"g": array([1.0, 2.0])}, compute_all_jacobians=True)
+    assert_allclose(
+        jac["a"]["g"], array([[1.0, 0.0], [0.0, 2.0], [3.0, 0.0], [0.0, 4.0]])
+    )
+
+
+def test_memmap_outputs():
+    """Test that the large outputs are memory-mapped files written by Scilab."""
+    disc = ScilabDiscipline("dummy_func5", DIRNAME, memmap_threshold=1)
+    out = disc.execute({"b": array([2.0])})
+    assert isinstance(out["a"], ScilabMemmap)
+    assert not out["a"].flags.writeable
+    assert_allclose(out["a"], array([6.0, 6.0]))
+    assert disc.cache.last_entry.outputs["a"] is out["a"]
+
+    disc = ScilabDiscipline("dummy_func1", DIRNAME, memmap_threshold=1)
+    out = disc.execute({"b": array([2.0])})
+    assert not isinstance(out["a"], ScilabMemmap)
+    assert_allclose(out["a"], array([6.0]))
+
+
+def test_memmap_outputs_with_required_outputs():
+    """Test that the memory-mapped and required outputs cannot be used together."""
+    with pytest.raises(ValueError, match="cannot be used together"):
+        ScilabDiscipline(
+            "dummy_func2", DIRNAME, required_output_names=["b"], memmap_threshold=1
+        )
+
+
 def test_func_fail_exec(caplog):
     """Test that an error is raised when a function fails to be executed in scilab.
 
@@ -0,0 +1,41 @@
+# Copyright 2021 IRT Saint Exupéry, https://www.irt-saintexupery.com
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License version 3 as published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with this program; if not, write to the Free Software Foundation,
+# Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+"""Tests for the surrogate fallback."""
+
+from __future__ import annotations
+
+from numpy import array
+from numpy import linspace
+from numpy.testing import assert_allclose
+
+from gemseo_scilab.surrogate_fallback import SurrogateFallback
+
+
+def test_surrogate_fallback():
+    """Test the training and the use of the surrogate fallback."""
+    fallback = SurrogateFallback(["x"], ["y"], 1e-2, training_period=5)
+    assert fallback.usage_ratio == 0.0
+
+    for x in linspace(0.0, 1.0, 9):
+        assert fallback.predict({"x": array([x])}) is None
+        fallback.add_sample({"x": array([x])}, {"y": 3.0 * x})
+
+    assert fallback.predict({"x": array([5.0])}) is None
+
+    output_data = fallback.predict({"x": array([0.5])})
+    assert_allclose(output_data["y"], array([1.5]), atol=1e-2)
+    assert fallback.n_calls == 11
+    assert fallback.n_surrogate_calls == 1
+    assert fallback.usage_ratio == 1 / 11